@@ -0,0 +1,69 @@
+'''
+Benchmark of the cluster moves of mcsim.Driver.
+
+An exchange-dominated lattice is relaxed from the same random state with different
+fractions of cluster moves. The energy is recorded every `chunk` moves and the integrated
+relaxation time of the energy,
+
+    tau = sum_t (E(t) - E_final) / (E(0) - E_final),
+
+measured in moves, is reported together with the wall-clock time. It is the
+zero-temperature counterpart of the integrated autocorrelation time: the smaller it is,
+the faster the lattice decorrelates from its initial state.
+
+Example usage:
+    python benchmarks/cluster_moves.py
+'''
+
+import time
+
+import numpy as np
+
+import mcsim
+
+
+def relaxation_time(energies, chunk):
+    '''
+    Return the integrated relaxation time of an energy series, in moves
+    '''
+    energies = np.asarray(energies)
+    excess = energies - energies[-1]
+    if excess[0] <= 0:
+        return 0.0
+    return chunk * np.sum(excess / excess[0])
+
+
+def run(n, cluster, moves, chunk, seed):
+    '''
+    Relax a random lattice and return the energy series and the elapsed time
+    '''
+    np.random.seed(seed)
+    s = mcsim.Spins(n=n)
+    s.randomise()
+    system = mcsim.System(s=s, B=(0, 0, 0), K=0, u=(0, 0, 1), J=1, D=0)
+    driver = mcsim.Driver()
+
+    energies = [system.energy()]
+    start = time.perf_counter()
+    for _ in range(moves // chunk):
+        driver.drive(system, n=chunk, cluster=cluster)
+        energies.append(system.energy())
+    return energies, time.perf_counter() - start
+
+
+def main(n=(6, 6), moves=10_000, chunk=100, seeds=(0, 1, 2), clusters=(0.0, 0.05, 0.2)):
+    print(f'lattice {n}, {moves} moves, averaged over {len(seeds)} seeds')
+    print(f'{"cluster":>8} {"tau [moves]":>12} {"final energy":>13} {"time [s]":>9}')
+    for cluster in clusters:
+        taus, finals, times = [], [], []
+        for seed in seeds:
+            energies, elapsed = run(n, cluster, moves, chunk, seed)
+            taus.append(relaxation_time(energies, chunk))
+            finals.append(energies[-1])
+            times.append(elapsed)
+        print(f'{cluster:>8.2f} {np.mean(taus):>12.0f} {np.mean(finals):>13.3f} '
+              f'{np.mean(times):>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
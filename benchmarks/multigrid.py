@@ -0,0 +1,77 @@
+'''
+Benchmark of mcsim.MultigridDriver against a direct relaxation.
+
+The same random lattice is relaxed directly on the original lattice and from coarse to
+fine lattices. The energy on the original lattice is recorded every `chunk` iterations,
+and the time needed to come within `tol` (relative) of the lowest energy found by either
+run is reported. The time of the multigrid run includes relaxing the coarse levels.
+
+Example usage:
+    python benchmarks/multigrid.py
+'''
+
+import time
+
+import numpy as np
+
+import mcsim
+
+
+def make_system(n, seed):
+    '''
+    Return a random system in an exchange-dominated regime with a small field
+    '''
+    np.random.seed(seed)
+    s = mcsim.Spins(n=n)
+    s.randomise()
+    return mcsim.System(s=s, B=(0, 0, 0.05), K=0.01, u=(0, 0, 1), J=1, D=0.1)
+
+
+def relax(system, driver, chunk, chunks, elapsed=0.0):
+    '''
+    Relax the system in chunks and return the (time, energy) trace
+    '''
+    trace = [(elapsed, system.energy())]
+    for _ in range(chunks):
+        start = time.perf_counter()
+        driver.drive(system, chunk)
+        elapsed += time.perf_counter() - start
+        trace.append((elapsed, system.energy()))
+    return trace
+
+
+def time_to(trace, target):
+    '''
+    Return a description of the first time at which the trace reaches the target energy
+    '''
+    for elapsed, energy in trace:
+        if energy <= target:
+            return f'{elapsed:8.2f} s'
+    return f'not reached in {trace[-1][0]:.2f} s'
+
+
+def main(n=(32, 32), driver=None, levels=3, chunk=20_000, chunks=15,
+         coarse_moves=20_000, tol=0.02, seed=0):
+    driver = mcsim.Driver() if driver is None else driver
+
+    system = make_system(n, seed)
+    direct = relax(system, driver, chunk, chunks)
+
+    system = make_system(n, seed)
+    multigrid = mcsim.MultigridDriver(driver=driver, levels=levels)
+    multigrid.drive(system, n=[coarse_moves] * (levels - 1) + [chunk])
+    for shape, seconds, energy in multigrid.timings:
+        print(f'level {shape}: {seconds:.2f} s, energy {energy:.3f}')
+    coarse_time = sum(seconds for _, seconds, _ in multigrid.timings)
+    trace = [(coarse_time, system.energy())]
+    trace += relax(system, driver, chunk, chunks - 1, coarse_time)[1:]
+
+    best = min(direct[-1][1], trace[-1][1])
+    target = best + tol * abs(best)
+    print(f'lattice {n}, converged energy {best:.3f} (tolerance {tol:.0%})')
+    print(f'direct:    {time_to(direct, target)}, final energy {direct[-1][1]:.3f}')
+    print(f'multigrid: {time_to(trace, target)}, final energy {trace[-1][1]:.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+'''
+Benchmark of mcsim.WarmStartCache on a sweep of the magnetic field.
+
+The same sweep of B is relaxed with GradientDriver twice: every point from a random
+lattice (cold), and every point seeded from the cache (warm). The number of steps,
+the time and the statistics of the cache are reported, with the moves saved measured
+against the steps of the cold sweep.
+
+Example usage:
+    python benchmarks/warm_start.py
+'''
+
+import time
+
+import numpy as np
+
+import mcsim
+
+
+def sweep(n, fields, cache, seed):
+    '''
+    Relax the system for every field and return the total steps and time
+    '''
+    np.random.seed(seed)
+    driver = mcsim.GradientDriver()
+    steps, start = 0, time.perf_counter()
+    for Bz in fields:
+        s = mcsim.Spins(n=n)
+        s.randomise()
+        system = mcsim.System(s=s, B=(0, 0, Bz), K=0.01, u=(0, 0, 1), J=1, D=0.3)
+        if cache is None:
+            driver.drive(system, n=20_000, tol=1e-4)
+        else:
+            cache.drive(driver, system, n=20_000, tol=1e-4)
+        steps += driver.steps
+    return steps, time.perf_counter() - start
+
+
+def main(n=(32, 32), fields=np.linspace(0.2, 0.5, 16), seed=0):
+    cold_steps, cold_time = sweep(n, fields, None, seed)
+    cache = mcsim.WarmStartCache(noise=0.01)
+    warm_steps, warm_time = sweep(n, fields, cache, seed)
+
+    print(f'lattice {n}, {len(fields)} field values')
+    print(f'cold: {cold_steps:7d} steps, {cold_time:6.2f} s')
+    print(f'warm: {warm_steps:7d} steps, {warm_time:6.2f} s')
+    for name, value in cache.report(cold_steps=cold_steps).items():
+        print(f'{name}: {value}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,11 @@
 from .driver import Driver
+from .driver import GradientDriver
 from .driver import random_spin
+from .driver import wolff_cluster
 from .spins import Spins
+from .interactions import Interactions
 from .system import System
+from .render import Renderer
+from .multigrid import MultigridDriver
+from .store import ResultStore
+from .warmstart import WarmStartCache
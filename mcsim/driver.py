@@ -5,13 +5,26 @@ total energy of the system until it reaches a minimum, depending on the system's
 This Method accepts a system class of instance System and does not return anything, as the
 changes are automatically done to the system.
 
+Besides single-spin moves, the driver can mix in Wolff-style cluster moves, in which a
+cluster of spins is grown from a random seed spin and all of its spins are reflected
+together about a random plane. They relax ordered, exchange-dominated systems much faster.
+
+For zero-temperature ground states, the GradientDriver is a deterministic alternative. It
+follows the damping term of the Landau-Lifshitz-Gilbert equation, turning all spins
+towards their effective field at once, until the largest torque is below a tolerance.
+
 Example usage:
     driver = mcsim.Driver() # Initialise the driver class
     driver.drive(system, n=10_000) #Run the Simulation with n=10000 simulations
+    driver.drive(system, n=10_000, cluster=0.1) #Make 10% of the moves cluster moves
+    driver = mcsim.GradientDriver() # Initialise the deterministic driver
+    driver.drive(system, n=10_000, tol=1e-6) #At most n=10000 steps
 
 '''
 
 import numpy as np
+
+from .interactions import Interactions
 def random_spin(s0, alpha=0.1):
     """Generate a new random spin based on the original one.
 
@@ -36,17 +49,93 @@ def random_spin(s0, alpha=0.1):
     s1 = s0 + delta_s
     return s1 / np.linalg.norm(s1)
 
+def random_direction():
+    """Generate a random unit vector, uniformly distributed on the sphere.
+
+    Returns
+    -------
+    np.ndarray
+
+        Random vector, normalised to 1.
+
+    """
+    r = np.random.normal(size=3)
+    return r / np.linalg.norm(r)
+
+def wolff_cluster(array, seed, r, J, beta=1.0):
+    """Grow a Wolff cluster of spins around a seed spin.
+
+    Spins are embedded into an Ising model by their projections onto ``r``.
+    A neighbour ``j`` of a spin ``i`` in the cluster joins the cluster with
+    probability ``1 - exp(min(0, -2 * beta * Jij * (r.si) * (r.sj)))``, where
+    ``Jij`` is the exchange constant of the pair, so that mostly spins which
+    are aligned along ``r`` are grouped together.
+
+    Parameters
+    ----------
+    array: np.ndarray
+
+        Spins of the lattice, with shape ``(nx, ny, 3)``.
+
+    seed: tuple
+
+        Indices ``(i, j)`` of the spin the cluster is grown from.
+
+    r: np.ndarray
+
+        Normal of the reflection plane, normalised to 1.
+
+    J: numbers.Real, np.ndarray or mcsim.Interactions
+
+        Exchange energy constant of nearest neighbours, or one constant per
+        site with shape ``(nx, ny)``. If it is an ``mcsim.Interactions``, the
+        pairs and exchange constants of its neighbour table are used, which
+        also covers next-nearest neighbours and masks.
+
+    beta: float
+
+        Coupling used to grow the cluster. Larger beta, larger the clusters.
+        Defaults to 1.0.
+
+    Returns
+    -------
+    np.ndarray
+
+        Boolean mask with shape ``(nx, ny)``, True for the spins in the cluster.
+
+    """
+    nx, ny = array.shape[:2]
+    if not isinstance(J, Interactions):
+        J = Interactions((nx, ny), J=J)
+    proj = (array @ r).ravel()
+    cluster = np.zeros(nx * ny, dtype=bool)
+    first = seed[0] * ny + seed[1]
+    cluster[first] = True
+    stack = [first]
+    while stack:
+        i = stack.pop()
+        for n in range(J.indptr[i], J.indptr[i + 1]):
+            j = J.indices[n]
+            if not cluster[j]:
+                p = 1 - np.exp(min(0, -2 * beta * J.neighbour_exchange[n] * proj[i] * proj[j]))
+                if np.random.random() < p:
+                    cluster[j] = True
+                    stack.append(j)
+    return cluster.reshape(nx, ny)
+
 class Driver:
     """Driver class.
 
     Driver class does not take any input parameters at initialisation.
+    After a call to ``drive``, ``self.steps`` holds the number of moves that
+    were made.
 
     """
 
     def __init__(self):
-        pass
+        self.steps = 0
 
-    def drive(self, system, n, alpha=0.1):
+    def drive(self, system, n, alpha=0.1, cluster=0.0, beta=1.0, tol=None, window=1_000):
         """Initializes the Monte Carlo Simulation
 
         Parameters
@@ -63,23 +152,156 @@ class Driver:
 
             Larger alpha, larger the modification of the spin. Defaults to 0.1.
 
+        cluster: float
+
+            Fraction of the moves that are cluster moves instead of single-spin
+            moves, between 0 and 1. Defaults to 0.0.
+
+        beta: float
+
+            Coupling used to grow the clusters, see ``wolff_cluster``. Defaults
+            to 1.0.
+
+        tol: float
+
+            If given, the simulation stops early once the energy has decreased
+            by less than ``tol`` over the last ``window`` moves. Defaults to
+            None, meaning all n moves are made.
+
+        window: integer
+
+            Number of moves the decrease of the energy is measured over.
+            Defaults to 1000.
+
         """
+        if not 0 <= cluster <= 1:
+            raise ValueError(f"cluster must be between 0 and 1, not {cluster=}.")
+        self.steps = 0
+        decrease = 0.0
         for _ in range(n):
-            #taking the number of rows and columns
-            ij = (system.s.array.shape[0],system.s.array.shape[1])
-            #outputing a random column and row number
-            i = np.abs(int(((np.random.random()*2)-1)*ij[0]))
-            j = np.abs(int(((np.random.random()*2)-1)*ij[1]))
-            # Spin number {i},{j} has value {sij}
-            #calculating the current energy
-            e0 = system.energy()
-            #creating a backup of the current system
-            backup = np.copy(system.s.array)
-            #changing the random spin in our current system
-            system.s.array [i][j] = random_spin(system.s.array[i,j,:],alpha)
+            self.steps += 1
+            if cluster and np.random.random() < cluster:
+                decrease -= self.cluster_move(system, beta)
+            else:
+                #taking the number of rows and columns
+                ij = (system.s.array.shape[0],system.s.array.shape[1])
+                #outputing a random column and row number
+                i = np.abs(int(((np.random.random()*2)-1)*ij[0]))
+                j = np.abs(int(((np.random.random()*2)-1)*ij[1]))
+                # Spin number {i},{j} has value {sij}
+                #changing the random spin, only the spin and its neighbours
+                #are needed to calculate the change of the energy
+                s1 = random_spin(system.s.array[i,j,:],alpha)
+                # If the energy would increase, the change is rejected
+                delta = system.delta_energy(i, j, s1)
+                if delta <= 0:
+                    system.s.array[i, j] = s1
+                    decrease -= delta
+            # Stop once the energy has (almost) stopped decreasing
+            if tol is not None and self.steps % window == 0:
+                if decrease < tol:
+                    break
+                decrease = 0.0
+
+    def cluster_move(self, system, beta=1.0):
+        """Make a single Wolff-style cluster move.
+
+        A cluster is grown from a random spin and all of its spins are reflected
+        about the plane perpendicular to a random direction ``r``,
+        ``s -> s - 2 (s.r) r``. As for single-spin moves, the change is
+        rejected if it increases the total energy.
+
+        Parameters
+        ----------
+        system: System Class
+
+            The System that is automatically passed.
+
+        beta: float
+
+            Coupling used to grow the cluster, see ``wolff_cluster``. Defaults
+            to 1.0.
+
+        Returns
+        -------
+        float
+
+            Change of the total energy, 0 if the move was rejected.
+
+        """
+        array = system.s.array
+        seed = (np.random.randint(array.shape[0]), np.random.randint(array.shape[1]))
+        r = random_direction()
+        cluster = wolff_cluster(array, seed, r, system.interactions, beta)
+
+        e0 = system.energy()
+        backup = np.copy(array)
+        spins = array[cluster]
+        array[cluster] = spins - 2 * np.outer(spins @ r, r)
+        e1 = system.energy()
+        if e1 > e0:
+            system.s.array = backup
+            return 0.0
+        return e1 - e0
+
+class GradientDriver:
+    """Deterministic energy minimiser.
+
+    GradientDriver class does not take any input parameters at initialisation.
+    After a call to ``drive``, ``self.steps`` holds the number of steps that
+    were made and ``self.torque`` the largest torque ``|s x H_eff|`` reached.
+
+    """
+
+    def __init__(self):
+        self.steps = 0
+        self.torque = np.inf
+
+    def drive(self, system, n=10_000, dt=0.1, tol=1e-6):
+        """Relaxes the system into the nearest energy minimum
+
+        Every step moves all spins along the damping term of the LLG equation,
+        ``ds = dt * (s x H_eff) x s``, and normalises them again. A step that
+        would increase the total energy is rejected and the time step is
+        halved, while accepted steps let it grow again up to ``dt``.
+
+        Parameters
+        ----------
+        system: System Class
+
+            The System that is automatically passed.
+
+        n: integer
+
+            The maximum number of steps. Defaults to 10000.
+
+        dt: float
+
+            The largest time step. Defaults to 0.1.
+
+        tol: float
+
+            The relaxation stops once the largest torque ``|s x H_eff|`` on any
+            spin is below ``tol``. Defaults to 1e-6.
+
+        """
+        step = dt
+        e0 = system.energy()
+        self.steps = 0
+        while self.steps < n:
+            s = system.s.array
+            torque = np.cross(s, system.effective_field())
+            self.torque = np.max(np.linalg.norm(torque, axis=-1))
+            if self.torque < tol:
+                break
+            self.steps += 1
+            # (s x H) x s = H - (s.H) s is the component of H perpendicular to s
+            s1 = s + step * np.cross(torque, s)
+            system.s.array = s1 / np.linalg.norm(s1, axis=-1, keepdims=True)
             e1 = system.energy()
-            # Now we compare the difference between the old and the new
-            # If changes are rejected, revert to the old system
-            # stored in the backup
-            if e1>e0:
-                system.s.array = backup
+            if e1 > e0:
+                system.s.array = s
+                step /= 2
+            else:
+                e0 = e1
+                step = min(dt, 1.5 * step)
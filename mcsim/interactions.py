@@ -0,0 +1,257 @@
+'''
+This is a module that describes the pairwise interactions between the spins of a 2D Lattice.
+
+All pairs of interacting spins are found once, when the model is built, and stored in
+numpy arrays of indices and coefficients. The energies and fields are then computed from
+these tables without any Python loops, no matter how many types of interactions are used:
+
+    - the pairs table holds every interacting pair (a, b) once, with its exchange constant
+      and DMI vector, and is used for the total energies,
+    - the neighbour table (CSR-style, as in sparse matrices) holds the neighbours of every
+      spin, and is used for the fields and the change of energy of a single spin.
+
+The energy of a pair (a, b) with exchange constant J and DMI vector d is
+-J a.b + d.(a x b).
+
+Example usage:
+    interactions = mcsim.Interactions(n=(10, 10), J=1, D=0.5, J2=-0.1, dmi_type='bulk')
+    interactions.exchange(s.array) # total exchange energy of the spins
+    interactions.field(s.array) # field of all neighbours acting on every spin
+
+'''
+
+import numpy as np
+
+# Offsets (along the first and the second axis) to the nearest neighbours and to the
+# next-nearest (diagonal) neighbours. Every pair is only counted once.
+NEAREST = ((1, 0), (0, 1))
+NEXT_NEAREST = ((1, 1), (1, -1))
+
+
+def _site_values(value, n, name):
+    '''
+    This is a sub function that turns a parameter into one value per site
+
+    Parameters
+    ------------
+    value: a real number, or an array with one value per site
+    n: dimensions of the lattice
+    name: name of the parameter, used in the error message
+
+    Returns
+    ------------
+    The array with shape n holding the value of each site
+    '''
+    value = np.asarray(value, dtype=np.float64)
+    if value.ndim != 0 and value.shape != tuple(n):
+        raise ValueError(f"{name} must be a real number or have shape {tuple(n)}, "
+                         f"not {value.shape}.")
+    return np.broadcast_to(value, n)
+
+
+class Interactions:
+    """Pairwise interactions stored in precomputed tables.
+
+    Parameters
+    ----------
+    n: Iterable
+
+        Dimensions of the lattice ``n = (nx, ny)``.
+
+    J: numbers.Real or np.ndarray
+
+        Nearest-neighbour exchange energy constant. It can also be an array with
+        shape ``(nx, ny)``, one value per site, in which case the constant of a
+        pair is the average over its two sites. Defaults to 0.
+
+    D: numbers.Real or np.ndarray
+
+        Dzyaloshinskii-Moriya energy constant of nearest neighbours, a real
+        number or one value per site as ``J``. Defaults to 0.
+
+    J2: numbers.Real or np.ndarray
+
+        Next-nearest-neighbour (diagonal) exchange energy constant, a real
+        number or one value per site as ``J``. Defaults to 0.
+
+    dmi_type: str
+
+        ``'interfacial'``, where the DMI vector of a pair is ``D (r x z)``, or
+        ``'bulk'``, where it is ``D r``, with ``r`` the unit vector from the
+        first to the second spin of the pair (the first axis of the lattice is
+        x and the second is y). Defaults to ``'interfacial'``.
+
+    mask: np.ndarray
+
+        Boolean array with shape ``(nx, ny)``, False for the sites without an
+        atom. These sites do not interact with any other site. Defaults to
+        None, in which case all sites hold an atom.
+
+    """
+
+    def __init__(self, n, J=0.0, D=0.0, J2=0.0, dmi_type='interfacial', mask=None):
+        '''
+        Init function builds the pairs table and the neighbour table
+        '''
+        if len(n) != 2:
+            raise ValueError(f"Length of iterable n must be 2, not {len(n)=}.")
+        if dmi_type not in ('interfacial', 'bulk'):
+            raise ValueError(f"dmi_type must be 'interfacial' or 'bulk', not {dmi_type=}.")
+        self.n = tuple(n)
+        if mask is not None:
+            mask = np.asarray(mask, dtype=bool)
+            if mask.shape != self.n:
+                raise ValueError(f"mask must have shape {self.n}, not {mask.shape}.")
+        self.mask = mask
+        self.dmi_type = dmi_type
+
+        J = _site_values(J, self.n, 'J')
+        D = _site_values(D, self.n, 'D')
+        J2 = _site_values(J2, self.n, 'J2')
+
+        first, second, exchange, dmi = [], [], [], []
+        for offsets, constant, has_dmi in ((NEAREST, J, True), (NEXT_NEAREST, J2, False)):
+            if not constant.any() and not (has_dmi and D.any()):
+                continue
+            for offset in offsets:
+                a, b = self._pairs(offset)
+                first.append(a)
+                second.append(b)
+                exchange.append((constant.flat[a] + constant.flat[b]) / 2)
+                vector = np.zeros((len(a), 3))
+                if has_dmi:
+                    r = np.array([offset[0], offset[1], 0]) / np.hypot(*offset)
+                    if dmi_type == 'interfacial':
+                        r = np.cross(r, (0, 0, 1))
+                    vector = np.outer((D.flat[a] + D.flat[b]) / 2, r)
+                dmi.append(vector)
+
+        # pairs table, every interacting pair (a, b) once
+        self.pairs = np.stack([np.concatenate([np.zeros(0, dtype=int), *first]),
+                               np.concatenate([np.zeros(0, dtype=int), *second])], axis=1)
+        self.exchange_constants = np.concatenate([np.zeros(0), *exchange])
+        self.dmi_vectors = np.concatenate([np.zeros((0, 3)), *dmi])
+
+        # neighbour table, every pair is stored for both of its sites. The DMI vector
+        # changes sign for the second site, since d.(b x a) = -d.(a x b).
+        rows = np.concatenate([self.pairs[:, 0], self.pairs[:, 1]])
+        order = np.argsort(rows, kind='stable')
+        self.rows = rows[order]
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(self.rows,
+                                                                 minlength=self.size))])
+        self.indices = np.concatenate([self.pairs[:, 1], self.pairs[:, 0]])[order]
+        self.neighbour_exchange = np.concatenate([self.exchange_constants] * 2)[order]
+        self.neighbour_dmi = np.concatenate([self.dmi_vectors, -self.dmi_vectors])[order]
+
+    @property
+    def size(self):
+        """Number of sites in the lattice."""
+        return self.n[0] * self.n[1]
+
+    def _pairs(self, offset):
+        '''
+        Return the flat indices of all pairs of sites separated by offset
+        '''
+        i, j = np.meshgrid(np.arange(self.n[0]), np.arange(self.n[1]), indexing='ij')
+        k, l = i + offset[0], j + offset[1]
+        valid = (k >= 0) & (k < self.n[0]) & (l >= 0) & (l < self.n[1])
+        i, j, k, l = i[valid], j[valid], k[valid], l[valid]
+        if self.mask is not None:
+            present = self.mask[i, j] & self.mask[k, l]
+            i, j, k, l = i[present], j[present], k[present], l[present]
+        return i * self.n[1] + j, k * self.n[1] + l
+
+    def exchange(self, array):
+        """Total exchange energy of the spins.
+
+        Parameters
+        ----------
+        array: np.ndarray
+
+            Spins of the lattice, with shape ``(nx, ny, 3)``.
+
+        Returns
+        -------
+        float
+
+            Total exchange energy.
+
+        """
+        s = array.reshape(-1, 3)
+        products = np.einsum('ij,ij->i', s[self.pairs[:, 0]], s[self.pairs[:, 1]])
+        return -np.dot(self.exchange_constants, products)
+
+    def dmi(self, array):
+        """Total DMI energy of the spins.
+
+        Parameters
+        ----------
+        array: np.ndarray
+
+            Spins of the lattice, with shape ``(nx, ny, 3)``.
+
+        Returns
+        -------
+        float
+
+            Total DMI energy.
+
+        """
+        s = array.reshape(-1, 3)
+        crosses = np.cross(s[self.pairs[:, 0]], s[self.pairs[:, 1]])
+        return np.sum(self.dmi_vectors * crosses)
+
+    def field(self, array):
+        """Field of the neighbours acting on every spin.
+
+        The field ``h`` of a spin ``s`` is such that the energy of all pairs
+        of ``s`` is ``-s.h``, ``h = sum(J m + d x m)`` over all neighbours
+        ``m``. It is the exchange and DMI part of the effective field.
+
+        Parameters
+        ----------
+        array: np.ndarray
+
+            Spins of the lattice, with shape ``(nx, ny, 3)``.
+
+        Returns
+        -------
+        np.ndarray
+
+            Field with the same shape ``(nx, ny, 3)`` as the spins.
+
+        """
+        s = array.reshape(-1, 3)[self.indices]
+        contributions = (self.neighbour_exchange[:, np.newaxis] * s
+                         + np.cross(self.neighbour_dmi, s))
+        field = np.empty((self.size, 3))
+        for k in range(3):
+            field[:, k] = np.bincount(self.rows, weights=contributions[:, k],
+                                      minlength=self.size)
+        return field.reshape(array.shape)
+
+    def local_field(self, array, i, j):
+        """Field of the neighbours acting on a single spin.
+
+        Parameters
+        ----------
+        array: np.ndarray
+
+            Spins of the lattice, with shape ``(nx, ny, 3)``.
+
+        i, j: int
+
+            Indices of the spin.
+
+        Returns
+        -------
+        np.ndarray
+
+            Field acting on spin ``(i, j)``, see ``field``.
+
+        """
+        k = i * self.n[1] + j
+        start, stop = self.indptr[k], self.indptr[k + 1]
+        s = array.reshape(-1, 3)[self.indices[start:stop]]
+        return (self.neighbour_exchange[start:stop] @ s
+                + np.sum(np.cross(self.neighbour_dmi[start:stop], s), axis=0))
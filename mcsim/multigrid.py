@@ -0,0 +1,252 @@
+'''
+This is a module that relaxes large 2D Lattices of Spins from coarse to fine lattices.
+
+Long-wavelength structure relaxes very slowly with local moves. The multigrid driver
+therefore first relaxes a downsampled copy of the system, where every spin stands for a
+block of factor x factor spins, then upsamples the relaxed spins into the next finer
+lattice and continues relaxing there, until it reaches the original lattice.
+
+The energy parameters of a coarse system are rescaled with the lattice spacing, as in the
+continuum (micromagnetic) limit: the Zeeman and anisotropy energies are proportional to the
+area represented by a spin (factor**2), the DMI energy to the lattice spacing (factor),
+and the exchange energies (J and J2) do not change in two dimensions.
+
+Example usage:
+    multigrid = mcsim.MultigridDriver(levels=3) # Coarse lattices are 2x and 4x smaller
+    multigrid.drive(system, n=10_000) # Run n=10000 moves on every level
+    multigrid.timings # Shape, time and energy of every level
+
+'''
+
+import time
+
+import numpy as np
+
+from .driver import Driver
+from .spins import Spins
+from .system import System
+
+
+def downsample(s, factor=2):
+    """Downsample a spin field by averaging blocks of spins.
+
+    Parameters
+    ----------
+    s: mcsim.Spins
+
+        The spin field that is downsampled.
+
+    factor: int
+
+        Number of spins in each direction of a block. Defaults to 2.
+
+    Returns
+    -------
+    mcsim.Spins
+
+        Spin field with ``ceil(nx / factor) x ceil(ny / factor)`` spins, each
+        the normalised average of a block.
+
+    """
+    nx, ny = s.array.shape[:2]
+    coarse = np.add.reduceat(s.array, np.arange(0, nx, factor), axis=0)
+    coarse = np.add.reduceat(coarse, np.arange(0, ny, factor), axis=1)
+    # Blocks of exactly opposite spins average to zero, they keep their first spin.
+    norm = np.linalg.norm(coarse, axis=2)
+    zero = np.isclose(norm, 0)
+    coarse[zero] = s.array[::factor, ::factor][zero]
+
+    result = Spins(n=coarse.shape[:2])
+    result.array = coarse
+    result.normalise()
+    return result
+
+
+def upsample(s, n):
+    """Upsample a spin field by bilinear interpolation.
+
+    Parameters
+    ----------
+    s: mcsim.Spins
+
+        The spin field that is upsampled.
+
+    n: Iterable
+
+        Dimensions ``n = (nx, ny)`` of the upsampled spin field.
+
+    Returns
+    -------
+    mcsim.Spins
+
+        Spin field with ``nx x ny`` spins, normalised to 1.
+
+    """
+    array = s.array
+    result = array
+    for axis, (coarse, fine) in enumerate(zip(array.shape[:2], n)):
+        # Position of the fine spins in units of the coarse lattice spacing.
+        x = np.clip((np.arange(fine) + 0.5) * coarse / fine - 0.5, 0, coarse - 1)
+        lower = np.floor(x).astype(int)
+        upper = np.minimum(lower + 1, coarse - 1)
+        weight = (x - lower).reshape((-1, 1, 1) if axis == 0 else (1, -1, 1))
+        result = ((1 - weight) * np.take(result, lower, axis=axis)
+                  + weight * np.take(result, upper, axis=axis))
+    norm = np.linalg.norm(result, axis=2)
+    # Interpolating between exactly opposite spins gives zero, use the nearest spin.
+    zero = np.isclose(norm, 0)
+    if zero.any():
+        ix = np.minimum((np.arange(n[0]) * array.shape[0]) // n[0], array.shape[0] - 1)
+        iy = np.minimum((np.arange(n[1]) * array.shape[1]) // n[1], array.shape[1] - 1)
+        result[zero] = array[np.ix_(ix, iy)][zero]
+
+    upsampled = Spins(n=tuple(int(i) for i in n))
+    upsampled.array = result
+    upsampled.normalise()
+    return upsampled
+
+
+def _block_mean(value, factor):
+    '''
+    This is a sub function that averages a parameter with one value per site over blocks
+
+    Parameters
+    ------------
+    value: a parameter, either a single value or an array with one value per site
+    factor: number of sites in each direction of a block
+
+    Returns
+    ------------
+    The parameter of the coarse lattice, single values are returned unchanged
+    '''
+    array = np.asarray(value, dtype=np.float64)
+    if array.ndim < 2:
+        return value
+    sums = np.add.reduceat(array, np.arange(0, array.shape[0], factor), axis=0)
+    sums = np.add.reduceat(sums, np.arange(0, array.shape[1], factor), axis=1)
+    counts = np.add.reduceat(np.ones(array.shape[:2]), np.arange(0, array.shape[0], factor),
+                             axis=0)
+    counts = np.add.reduceat(counts, np.arange(0, array.shape[1], factor), axis=1)
+    return sums / counts.reshape(counts.shape + (1,) * (array.ndim - 2))
+
+
+def coarsen(system, factor=2):
+    """Build a coarse copy of a system.
+
+    Parameters with one value per site are averaged over the blocks, and a
+    coarse site holds an atom if at least half of its block does.
+
+    Parameters
+    ----------
+    system: mcsim.System
+
+        The system that is coarsened.
+
+    factor: int
+
+        Number of spins in each direction represented by a coarse spin.
+        Defaults to 2.
+
+    Returns
+    -------
+    mcsim.System
+
+        Coarse system, with spins downsampled from ``system`` and rescaled
+        energy parameters.
+
+    """
+    mask = system.mask
+    if mask is not None:
+        mask = _block_mean(np.asarray(mask, dtype=np.float64), factor) >= 0.5
+    return System(s=downsample(system.s, factor),
+                  B=factor**2 * np.asarray(_block_mean(system.B, factor), dtype=np.float64),
+                  K=factor**2 * np.asarray(_block_mean(system.K, factor)),
+                  u=system.u,
+                  J=_block_mean(system.J, factor),
+                  D=factor * np.asarray(_block_mean(system.D, factor)),
+                  J2=_block_mean(system.J2, factor),
+                  dmi_type=system.dmi_type,
+                  mask=mask)
+
+
+class MultigridDriver:
+    """Coarse-to-fine driver.
+
+    Parameters
+    ----------
+    driver: Driver Class
+
+        The driver that relaxes every level. Defaults to ``mcsim.Driver()``.
+
+    levels: int
+
+        Number of levels, including the original lattice. Coarsening stops
+        earlier if a lattice would have fewer than 2 spins in some direction.
+        Defaults to 3.
+
+    factor: int
+
+        Coarsening factor between two consecutive levels. Defaults to 2.
+
+    """
+
+    def __init__(self, driver=None, levels=3, factor=2):
+        '''
+        Init function initializes the user inputs into the class created
+        '''
+        if levels <= 0 or not isinstance(levels, int):
+            raise ValueError("levels must be a positive integer.")
+        if factor <= 1 or not isinstance(factor, int):
+            raise ValueError("factor must be an integer larger than 1.")
+        self.driver = Driver() if driver is None else driver
+        self.levels = levels
+        self.factor = factor
+        self.timings = []
+
+    def drive(self, system, n, **kwargs):
+        """Relax the system from the coarsest to the original lattice.
+
+        The spins of ``system`` are changed in place. After the call,
+        ``self.timings`` holds a tuple ``(shape, seconds, energy)`` for every
+        level, from the coarsest to the original lattice.
+
+        Parameters
+        ----------
+        system: System Class
+
+            The System that is automatically passed.
+
+        n: int or Iterable
+
+            Number of iterations passed to the driver on every level, or one
+            number per level ordered from the coarsest to the original lattice.
+
+        kwargs
+
+            Other keyword arguments are passed to ``driver.drive``.
+
+        """
+        systems = [system]
+        while (len(systems) < self.levels
+               and min(systems[-1].s.array.shape[:2]) >= 2 * self.factor):
+            systems.append(coarsen(systems[-1], self.factor))
+        systems.reverse()
+
+        if isinstance(n, int):
+            n = [n] * len(systems)
+        else:
+            # If fewer levels fit into the lattice, the coarsest values are dropped.
+            n = list(n)[-len(systems):]
+            if len(n) != len(systems):
+                raise ValueError(f"n must have one value per level, not {len(n)=}.")
+
+        self.timings = []
+        previous = None
+        for level, iterations in zip(systems, n):
+            start = time.perf_counter()
+            if previous is not None:
+                level.s.array = upsample(previous.s, level.s.array.shape[:2]).array
+            self.driver.drive(level, iterations, **kwargs)
+            self.timings.append((level.s.array.shape[:2], time.perf_counter() - start,
+                                 level.energy()))
+            previous = level
@@ -0,0 +1,291 @@
+'''
+This is a module that renders the states of a 2D Lattice of Spins into images and animations.
+
+Unlike Spins.plot, which builds a brand new figure every time it is called, the Renderer
+builds a single figure once and only updates the data of its artists for every new frame.
+It never touches pyplot, so it works with the Agg backend on a machine without a display.
+
+This Method accepts a trajectory, which is any iterable of Spins instances or of numpy
+arrays with shape (nx, ny, 3), and writes it into PNG frames or into a GIF/MP4 animation.
+
+Example usage:
+    renderer = mcsim.Renderer(n=(100, 100)) # Initialise the renderer for a 100x100 lattice
+    renderer.save_frames(trajectory, 'frames', processes=4) # PNG frames, 4 worker processes
+    renderer.animate(trajectory, 'relaxation.gif', fps=10) # GIF animation of the trajectory
+
+'''
+
+import math
+import multiprocessing
+import os
+
+import numpy as np
+from matplotlib import animation
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+def _as_array(frame):
+    '''
+    This is a sub function that returns the spin array of a single frame
+
+    Parameters
+    ------------
+    frame: an instance of Spins or a numpy array with shape (nx, ny, 3)
+
+    Returns
+    ------------
+    The numpy array holding the spins of the frame
+    '''
+    return np.asarray(getattr(frame, 'array', frame), dtype=np.float64)
+
+
+class Renderer:
+    """Renderer of spin-field frames.
+
+    The figure is identical in layout to the one produced by ``Spins.plot``:
+    a quiver plot of the in-plane spin components on the left and a map of
+    the z component on the right, both with a colorbar. It is built only once
+    and every new frame only replaces the data held by the artists.
+
+    Parameters
+    ----------
+    n: Iterable
+
+        Dimensions of the lattice ``n = (nx, ny)`` of all frames that will be
+        rendered.
+
+    step: int
+
+        Only every ``step``-th spin in each direction is drawn as an arrow. If
+        not given, it is chosen so that no more than ``max_arrows`` arrows are
+        drawn in each direction. The z-component map is always drawn at full
+        resolution.
+
+    max_arrows: int
+
+        Maximum number of arrows in each direction when ``step`` is not given.
+        Defaults to 32.
+
+    figsize: Iterable
+
+        Size of the figure in inches. Defaults to ``(12, 5)``.
+
+    dpi: int
+
+        Resolution of the rendered images. Defaults to 100.
+
+    """
+
+    def __init__(self, n, step=None, max_arrows=32, figsize=(12, 5), dpi=100):
+        '''
+        Init function builds the figure and the artists that are reused for every frame
+        '''
+        if len(n) != 2:
+            raise ValueError(f"Length of iterable n must be 2, not {len(n)=}.")
+        if step is None:
+            step = max(1, math.ceil(max(n) / max_arrows))
+        if step <= 0 or not isinstance(step, int):
+            raise ValueError("step must be a positive integer.")
+
+        self.n = tuple(n)
+        self.step = step
+        self.max_arrows = max_arrows
+        self.figsize = figsize
+        self.dpi = dpi
+
+        # The figure is attached to an Agg canvas directly, so no GUI backend is needed.
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        arrow, topography = self.fig.subplots(ncols=2)
+
+        # Grid of points, the first array index runs along x and the second along y.
+        xs = np.arange(0, self.n[0], step)
+        ys = np.arange(0, self.n[1], step)
+        x, y = np.meshgrid(xs, ys, indexing='ij')
+        zeros = np.zeros_like(x, dtype=np.float64)
+
+        self.atoms = arrow.quiver(x, y, zeros, zeros, zeros, pivot='middle',
+                                  cmap="RdYlBu_r", clim=(-1, 1))
+        self.mountains = topography.imshow(np.zeros(self.n[::-1]), origin='lower',
+                                           cmap="RdYlBu_r", vmin=-1, vmax=1,
+                                           interpolation='nearest')
+        arrow.set_xlim(-step, self.n[0] - 1 + step)
+        arrow.set_ylim(-step, self.n[1] - 1 + step)
+        arrow.set_aspect('equal')
+
+        direction = self.fig.colorbar(self.atoms, ax=arrow, orientation='vertical')
+        height = self.fig.colorbar(self.mountains, ax=topography, orientation='vertical')
+        height.set_label('The height')
+        direction.set_label('The Z Coordinate')
+
+    def _config(self):
+        '''
+        Return the arguments needed to build an identical renderer in a worker process
+        '''
+        return dict(n=self.n, step=self.step, max_arrows=self.max_arrows,
+                    figsize=self.figsize, dpi=self.dpi)
+
+    def update(self, frame):
+        """Update the artists with the spins of a new frame.
+
+        Parameters
+        ----------
+        frame: mcsim.Spins or np.ndarray
+
+            The spins of the frame, with shape ``(nx, ny, 3)``.
+
+        Returns
+        -------
+        tuple
+
+            The artists that have been modified.
+
+        """
+        array = _as_array(frame)
+        if array.shape != (*self.n, 3):
+            raise ValueError(f"Frame shape must be {(*self.n, 3)}, not {array.shape}.")
+        arrows = array[::self.step, ::self.step, :]
+        self.atoms.set_UVC(arrows[..., 0], arrows[..., 1], arrows[..., 2])
+        self.mountains.set_data(array[..., 2].T)
+        return self.atoms, self.mountains
+
+    def render(self, frame):
+        """Render a single frame into an image.
+
+        Parameters
+        ----------
+        frame: mcsim.Spins or np.ndarray
+
+            The spins of the frame, with shape ``(nx, ny, 3)``.
+
+        Returns
+        -------
+        np.ndarray
+
+            RGBA image of the frame with shape ``(height, width, 4)``.
+
+        """
+        self.update(frame)
+        self.canvas.draw()
+        return np.array(self.canvas.buffer_rgba())
+
+    def save(self, frame, filename):
+        """Render a single frame and save it into an image file.
+
+        Parameters
+        ----------
+        frame: mcsim.Spins or np.ndarray
+
+            The spins of the frame, with shape ``(nx, ny, 3)``.
+
+        filename: str
+
+            Name of the image file, its format is deduced from the extension.
+
+        """
+        self.update(frame)
+        self.fig.savefig(filename, dpi=self.dpi)
+
+    def save_frames(self, trajectory, directory, prefix='frame', processes=1):
+        """Save every frame of a trajectory into a numbered PNG file.
+
+        Parameters
+        ----------
+        trajectory: Iterable
+
+            Frames to be saved, each an ``mcsim.Spins`` or a numpy array with
+            shape ``(nx, ny, 3)``.
+
+        directory: str
+
+            Directory where the frames are saved. It is created if it does not
+            exist.
+
+        prefix: str
+
+            Prefix of the names of the files. Defaults to ``'frame'``.
+
+        processes: int
+
+            Number of worker processes that render the frames. Every worker
+            builds its own figure once. Defaults to 1, in which case the frames
+            are rendered in the current process.
+
+        Returns
+        -------
+        list
+
+            Names of the saved files, in the order of the trajectory.
+
+        """
+        os.makedirs(directory, exist_ok=True)
+        arrays = [_as_array(frame) for frame in trajectory]
+        width = max(4, len(str(len(arrays))))
+        filenames = [os.path.join(directory, f'{prefix}{i:0{width}d}.png')
+                     for i in range(len(arrays))]
+        jobs = list(zip(arrays, filenames))
+
+        if processes == 1 or len(jobs) <= 1:
+            for array, filename in jobs:
+                self.save(array, filename)
+        else:
+            chunksize = max(1, len(jobs) // (4 * processes))
+            with multiprocessing.Pool(processes, initializer=_init_worker,
+                                      initargs=(self._config(),)) as pool:
+                # Consuming the iterator so that errors in workers are raised here.
+                for _ in pool.imap_unordered(_save_worker, jobs, chunksize=chunksize):
+                    pass
+        return filenames
+
+    def animate(self, trajectory, filename, fps=10, writer=None):
+        """Save a trajectory into an animation.
+
+        Parameters
+        ----------
+        trajectory: Iterable
+
+            Frames of the animation, each an ``mcsim.Spins`` or a numpy array
+            with shape ``(nx, ny, 3)``.
+
+        filename: str
+
+            Name of the animation file, for example ``'relaxation.gif'`` or
+            ``'relaxation.mp4'``.
+
+        fps: int
+
+            Frames per second. Defaults to 10.
+
+        writer: str
+
+            Name of the matplotlib animation writer. If not given, ``'pillow'``
+            is used for GIF files and ``'ffmpeg'`` otherwise.
+
+        """
+        arrays = [_as_array(frame) for frame in trajectory]
+        if writer is None:
+            writer = 'pillow' if filename.lower().endswith('.gif') else 'ffmpeg'
+        anim = animation.FuncAnimation(self.fig, self.update, frames=arrays,
+                                       blit=False, cache_frame_data=False)
+        anim.save(filename, writer=writer, fps=fps, dpi=self.dpi)
+
+
+# The renderer of a worker process, built once by _init_worker.
+_worker_renderer = None
+
+
+def _init_worker(config):
+    '''
+    This is a sub function that builds the renderer of a worker process
+    '''
+    global _worker_renderer
+    _worker_renderer = Renderer(**config)
+
+
+def _save_worker(job):
+    '''
+    This is a sub function that saves a single frame in a worker process
+    '''
+    array, filename = job
+    _worker_renderer.save(array, filename)
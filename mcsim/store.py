@@ -0,0 +1,373 @@
+'''
+This is a module that stores the results of parameter sweeps in a single compact archive.
+
+The archive is a directory with two files:
+
+    - lattices.bin holds the spin arrays, split into chunks of rows that are compressed
+      one by one, so that loading a few rows does not decompress the whole lattice,
+    - index.bin holds one fixed-size record per result with the parameters B, K, u, J, D,
+      J2 and dmi_type, the seed, the shape of the lattice and the position of its chunks
+      in lattices.bin.
+
+Both files are only ever appended to, under a file lock, so that workers running in
+parallel processes can add results to the same archive. The index is memory-mapped and
+searched with numpy, and a lattice is only read and decompressed when it is loaded.
+
+Example usage:
+    store = mcsim.ResultStore('sweep') # Open (or create) the archive in directory sweep
+    store.append(system, seed=42) # Add the final state of a simulation
+    store.query(J=1, D=0.5) # Indices of the results with J=1 and D=0.5
+    store.nearest(B=(0, 0, 0.1), D=0.5, k=3) # Indices of the 3 nearest results
+    store.load(0) # Spin array of the first result
+
+'''
+
+import os
+import zlib
+from contextlib import contextmanager
+
+import numpy as np
+
+from .spins import Spins
+from .system import System
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Record of the index, one per result.
+RECORD = np.dtype([('B', '<f8', 3), ('K', '<f8'), ('u', '<f8', 3), ('J', '<f8'),
+                   ('D', '<f8'), ('J2', '<f8'), ('dmi_type', '<U11'), ('seed', '<i8'),
+                   ('shape', '<i8', 2), ('offset', '<i8'), ('length', '<i8'),
+                   ('chunk_rows', '<i8')])
+
+# Parameters that can be used to measure distances in the index.
+DISTANCE_PARAMETERS = ('B', 'K', 'u', 'J', 'D', 'J2')
+
+# Parameters that can be used to search the index.
+PARAMETERS = DISTANCE_PARAMETERS + ('dmi_type', 'seed')
+
+
+@contextmanager
+def _locked(path):
+    '''
+    This is a sub function that holds an exclusive lock on a file while the context is open
+
+    Parameters
+    ------------
+    path: path of the lock file, created if it does not exist
+    '''
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class ResultStore:
+    """Archive of simulation results.
+
+    Parameters
+    ----------
+    path: str
+
+        Directory of the archive. It is created if it does not exist.
+
+    chunk_rows: int
+
+        Number of rows of a lattice that are compressed together. Defaults to
+        64.
+
+    level: int
+
+        zlib compression level, between 0 and 9. Defaults to 6.
+
+    """
+
+    def __init__(self, path, chunk_rows=64, level=6):
+        '''
+        Init function opens the archive, creating its files if needed
+        '''
+        if chunk_rows <= 0 or not isinstance(chunk_rows, int):
+            raise ValueError("chunk_rows must be a positive integer.")
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.level = level
+        os.makedirs(path, exist_ok=True)
+        self._data = os.path.join(path, 'lattices.bin')
+        self._index = os.path.join(path, 'index.bin')
+        self._lock = os.path.join(path, 'store.lock')
+        for filename in (self._data, self._index):
+            open(filename, 'ab').close()
+        self._records = None
+        self._memmap = None
+
+    def __len__(self):
+        return os.path.getsize(self._index) // RECORD.itemsize
+
+    @property
+    def index(self):
+        """Memory-mapped index of all results, a numpy structured array.
+
+        Its fields are ``B``, ``K``, ``u``, ``J``, ``D``, ``J2``,
+        ``dmi_type``, ``seed`` and ``shape``, and the position of the lattice
+        in the archive.
+
+        """
+        count = len(self)
+        if self._records is None or len(self._records) != count:
+            if count == 0:
+                self._records = np.zeros(0, dtype=RECORD)
+            else:
+                self._records = np.memmap(self._index, dtype=RECORD, mode='r',
+                                          shape=(count,))
+        return self._records
+
+    def _bytes(self):
+        '''
+        Return the memory-mapped lattices file, reopened if it has grown
+        '''
+        size = os.path.getsize(self._data)
+        if self._memmap is None or len(self._memmap) != size:
+            self._memmap = np.memmap(self._data, dtype=np.uint8, mode='r', shape=(size,))
+        return self._memmap
+
+    def append(self, system, seed=-1):
+        """Add the spins and parameters of a system to the archive.
+
+        It is safe to call this method from several processes at the same time.
+
+        Parameters
+        ----------
+        system: mcsim.System
+
+            The system, its parameters ``B``, ``K``, ``J``, ``D`` and ``J2``
+            must be the same for all sites, and it must not have a ``mask``.
+
+        seed: int
+
+            Seed of the random number generator used for the simulation.
+            Defaults to -1, meaning unknown.
+
+        Returns
+        -------
+        int
+
+            Index of the new result.
+
+        """
+        if system.mask is not None:
+            raise ValueError("Only systems without a mask can be stored.")
+        record = np.zeros(1, dtype=RECORD)
+        for name in DISTANCE_PARAMETERS:
+            value = np.asarray(getattr(system, name), dtype=np.float64)
+            if value.shape != record[name].shape[1:]:
+                raise ValueError(f"Only systems with a single value of {name} can be "
+                                 f"stored, not {value.shape=}.")
+            record[name] = value
+        record['dmi_type'] = system.dmi_type
+        array = np.ascontiguousarray(system.s.array, dtype='<f8')
+        record['seed'] = seed
+        record['shape'] = array.shape[:2]
+        record['chunk_rows'] = self.chunk_rows
+
+        # The chunk lengths come first, so that a single chunk can be found and read.
+        chunks = [zlib.compress(array[i:i + self.chunk_rows].tobytes(), self.level)
+                  for i in range(0, array.shape[0], self.chunk_rows)]
+        lengths = np.array([len(chunk) for chunk in chunks], dtype='<i8')
+        payload = lengths.tobytes() + b''.join(chunks)
+        record['length'] = len(payload)
+
+        with _locked(self._lock):
+            with open(self._data, 'ab') as f:
+                record['offset'] = f.seek(0, os.SEEK_END)
+                f.write(payload)
+            # The record is written last, readers never see a result without its data.
+            with open(self._index, 'ab') as f:
+                f.write(record.tobytes())
+                return f.tell() // RECORD.itemsize - 1
+
+    def _mask(self, shape, dmi_type=None):
+        '''
+        Return the results that have a lattice of the given shape and the given type of DMI,
+        any shape or type is accepted if it is None
+        '''
+        index = self.index
+        selected = np.ones(len(index), dtype=bool)
+        if shape is not None:
+            selected &= np.all(index['shape'] == tuple(shape), axis=1)
+        if dmi_type is not None:
+            selected &= index['dmi_type'] == dmi_type
+        return selected
+
+    def query(self, shape=None, **conditions):
+        """Find the results with the given parameters.
+
+        Parameters
+        ----------
+        shape: Iterable
+
+            Only results with this lattice shape ``(nx, ny)`` are returned.
+            Defaults to None, meaning any shape.
+
+        conditions
+
+            Values of any of ``B``, ``K``, ``u``, ``J``, ``D``, ``J2``,
+            ``dmi_type`` and ``seed``. Numbers are compared with
+            ``np.isclose``.
+
+        Returns
+        -------
+        np.ndarray
+
+            Indices of the matching results.
+
+        """
+        index = self.index
+        selected = self._mask(shape, conditions.pop('dmi_type', None))
+        for name, value in conditions.items():
+            if name not in PARAMETERS:
+                raise ValueError(f"Unknown parameter {name=}.")
+            close = np.isclose(index[name], value)
+            selected &= close.all(axis=tuple(range(1, close.ndim)))
+        return np.flatnonzero(selected)
+
+    def nearest(self, k=1, shape=None, dmi_type=None, **parameters):
+        """Find the results nearest to a point in parameter space.
+
+        The distance is Euclidean over the given parameters, with vectors
+        ``B`` and ``u`` contributing all three of their components.
+
+        Parameters
+        ----------
+        k: int
+
+            Number of results returned. Defaults to 1.
+
+        shape: Iterable
+
+            Only results with this lattice shape ``(nx, ny)`` are considered.
+            Defaults to None, meaning any shape.
+
+        dmi_type: str
+
+            Only results with this type of DMI are considered. Defaults to
+            None, meaning any type.
+
+        parameters
+
+            Values of any of ``B``, ``K``, ``u``, ``J``, ``D`` and ``J2``.
+
+        Returns
+        -------
+        np.ndarray
+
+            Indices of at most ``k`` results, nearest first.
+
+        """
+        index = self.index
+        candidates = np.flatnonzero(self._mask(shape, dmi_type))
+        distance = np.zeros(len(candidates))
+        for name, value in parameters.items():
+            if name not in DISTANCE_PARAMETERS:
+                raise ValueError(f"Unknown parameter {name=}.")
+            difference = index[name][candidates] - np.asarray(value, dtype=np.float64)
+            distance += np.sum(difference ** 2, axis=tuple(range(1, difference.ndim)))
+        order = np.argsort(distance, kind='stable')[:k]
+        return candidates[order]
+
+    def load(self, i, rows=None):
+        """Load the spin array of a result.
+
+        Only the chunks that hold the requested rows are read and decompressed.
+
+        Parameters
+        ----------
+        i: int
+
+            Index of the result.
+
+        rows: slice
+
+            Rows of the lattice to be loaded. Defaults to None, meaning all rows.
+
+        Returns
+        -------
+        np.ndarray
+
+            The spins, with shape ``(nx, ny, 3)`` or ``(len(rows), ny, 3)``.
+
+        """
+        record = self.index[i]
+        nx, ny = (int(n) for n in record['shape'])
+        chunk_rows = int(record['chunk_rows'])
+        rows = range(nx)[rows if rows is not None else slice(None)]
+        if rows.step != 1:
+            raise ValueError("rows must be a slice with step 1.")
+        first = rows.start // chunk_rows if len(rows) else 0
+        last = (rows.stop - 1) // chunk_rows + 1 if len(rows) else 0
+
+        count = -(-nx // chunk_rows)
+        data = self._bytes()
+        offset = int(record['offset'])
+        lengths = data[offset:offset + 8 * count].view('<i8')
+        ends = offset + 8 * count + np.cumsum(lengths)
+        chunks = [zlib.decompress(data[end - length:end])
+                  for end, length in zip(ends[first:last], lengths[first:last])]
+        array = np.frombuffer(b''.join(chunks), dtype='<f8').reshape(-1, ny, 3)
+        start = rows.start - first * chunk_rows
+        return array[start:start + len(rows)].copy()
+
+    def lattices(self, indices):
+        """Load the spin arrays of several results, one at a time.
+
+        Parameters
+        ----------
+        indices: Iterable
+
+            Indices of the results, for example returned by ``query``.
+
+        Yields
+        ------
+        np.ndarray
+
+            The spins of every result, in the order of ``indices``.
+
+        """
+        for i in indices:
+            yield self.load(i)
+
+    def system(self, i):
+        """Rebuild the system of a result.
+
+        Parameters
+        ----------
+        i: int
+
+            Index of the result.
+
+        Returns
+        -------
+        mcsim.System
+
+            System with the stored spins and parameters.
+
+        """
+        record = self.index[i]
+        array = self.load(i)
+        s = Spins(n=array.shape[:2])
+        s.array = array
+        return System(s=s, B=tuple(record['B']), K=float(record['K']), u=tuple(record['u']),
+                      J=float(record['J']), D=float(record['D']), J2=float(record['J2']),
+                      dmi_type=str(record['dmi_type']))
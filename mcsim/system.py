@@ -14,11 +14,17 @@ Example usage:
     J is the exchange energy constant
     D is the DMI constant
 
+Beyond that, the system accepts next-nearest-neighbour exchange (J2), bulk DMI (dmi_type),
+masked geometries (mask) and one value of B, K, J, D or J2 per site (defects). The pairwise
+interactions are evaluated from the precomputed tables of mcsim.Interactions.
+
 
 '''
 
 import numpy as np
 
+from .interactions import Interactions
+
 def normalise(v):
     '''
     This is a sub function that normalizes the input vectors
@@ -45,11 +51,13 @@ class System:
 
     B: Iterable
 
-        External magnetic field, length 3.
+        External magnetic field, length 3, or one field per site with shape
+        ``(nx, ny, 3)``.
 
     K: numbers.Real
 
-        Uniaxial anisotropy constant.
+        Uniaxial anisotropy constant, or one constant per site with shape
+        ``(nx, ny)``.
 
     u: Iterable(float)
 
@@ -58,15 +66,35 @@ class System:
 
     J: numbers.Real
 
-        Exchange energy constant.
+        Exchange energy constant, or one constant per site with shape
+        ``(nx, ny)``.
 
     D: numbers.Real
 
-        Dzyaloshinskii-Moriya energy constant.
+        Dzyaloshinskii-Moriya energy constant, or one constant per site with
+        shape ``(nx, ny)``.
+
+    J2: numbers.Real
+
+        Next-nearest-neighbour exchange energy constant, or one constant per
+        site with shape ``(nx, ny)``. Defaults to 0.
+
+    dmi_type: str
+
+        ``'interfacial'`` or ``'bulk'`` DMI, see ``mcsim.Interactions``.
+        Defaults to ``'interfacial'``.
+
+    mask: np.ndarray
+
+        Boolean array with shape ``(nx, ny)``, False for the sites without an
+        atom. Defaults to None, in which case all sites hold an atom.
 
     """
 
-    def __init__(self, s, B, K, u, J, D):
+    # Parameters the interaction tables are built from.
+    _interaction_parameters = ('J', 'D', 'J2', 'dmi_type', 'mask')
+
+    def __init__(self, s, B, K, u, J, D, J2=0.0, dmi_type='interfacial', mask=None):
         '''
         Init function initializes the user inputs into the class created
         '''
@@ -76,6 +104,46 @@ class System:
         self.B = B
         self.K = K
         self.u = u
+        self.J2 = J2
+        self.dmi_type = dmi_type
+        self.mask = mask
+
+    def __setattr__(self, name, value):
+        '''
+        Assigning a new value to any of J, D, J2, dmi_type and mask rebuilds the interaction
+        tables the next time they are needed. Per-site values are stored as read-only copies,
+        so that they cannot be changed in place behind the back of the tables.
+        '''
+        if name in self._interaction_parameters:
+            if value is not None and np.ndim(value) > 0:
+                value = np.array(value, dtype=bool if name == 'mask' else np.float64)
+                value.setflags(write=False)
+            super().__setattr__('_interactions', None)
+        super().__setattr__(name, value)
+
+    @property
+    def interactions(self):
+        """Tables of the pairwise interactions (``mcsim.Interactions``).
+
+        They are built on first use and rebuilt after any of ``J``, ``D``,
+        ``J2``, ``dmi_type`` or ``mask`` is assigned a new value, or the shape
+        of the lattice changes. Per-site values of these parameters are
+        read-only, to change them assign a new array.
+
+        """
+        n = self.s.array.shape[:2]
+        if self._interactions is None or self._interactions.n != n:
+            self._interactions = Interactions(n, J=self.J, D=self.D, J2=self.J2,
+                                              dmi_type=self.dmi_type, mask=self.mask)
+        return self._interactions
+
+    def _sites(self):
+        '''
+        Return the spins, with the spins of the sites without an atom set to zero
+        '''
+        if self.mask is None:
+            return self.s.array
+        return self.s.array * np.asarray(self.mask)[..., np.newaxis]
 
     def energy(self):
         """Total energy of the system.
@@ -92,71 +160,86 @@ class System:
         """
         return self.zeeman() + self.anisotropy() + self.exchange() + self.dmi()
 
+    def delta_energy(self, i, j, s1):
+        """Change of the total energy if a single spin is changed.
+
+        Only the spin and its neighbours are involved, so this is much faster
+        than computing the total energy twice.
+
+        Parameters
+        ----------
+        i, j: int
+
+            Indices of the spin.
+
+        s1: np.ndarray
+
+            The new value of the spin.
+
+        Returns
+        -------
+        float
+
+            Total energy with the new spin minus the current total energy.
+
+        """
+        if self.mask is not None and not np.asarray(self.mask)[i, j]:
+            return 0.0
+        s0 = self.s.array[i, j]
+        u = normalise(np.asarray(self.u, dtype=np.float64))
+        B = np.asarray(self.B, dtype=np.float64)
+        B = B[i, j] if B.ndim == 3 else B
+        K = np.asarray(self.K, dtype=np.float64)
+        K = K[i, j] if K.ndim == 2 else K
+        field = B + self.interactions.local_field(self.s.array, i, j)
+        return -np.dot(s1 - s0, field) - K * (np.dot(s1, u) ** 2 - np.dot(s0, u) ** 2)
+
+    def effective_field(self):
+        """Effective field acting on every spin.
+
+        The effective field is the negative gradient of the total energy with
+        respect to the spins, ``H_eff = -dE/ds``, computed analytically for all
+        four energy terms at once.
+
+        Returns
+        -------
+        np.ndarray
+
+            Effective field with the same shape ``(nx, ny, 3)`` as the spins.
+
+        """
+        s = self.s.array
+        u = normalise(np.asarray(self.u, dtype=np.float64))
+        # zeeman and anisotropy act on each atom on its own
+        field = np.empty_like(s)
+        field[...] = self.B
+        field += 2 * np.asarray(self.K)[..., np.newaxis] * (s @ u)[..., np.newaxis] * u
+        if self.mask is not None:
+            field *= np.asarray(self.mask)[..., np.newaxis]
+        # exchange and DMI with the neighbours
+        return field + self.interactions.field(s)
+
     def zeeman(self):
         '''
         Calculate the sum of zeeman energies across all atoms
         '''
-        #creating an empty list that will contain all the zeeman energies
-        # of each atom
-        sums = []
-        for i in self.s.array:
-            for j in i:
-                #appending the zeeman energy of the selected atom
-                sums.append(np.dot(j,self.B)*-1)
-        return np.sum(sums)
+        return -np.sum(self._sites() * self.B)
 
     def anisotropy(self):
         '''
         Return the total uniaxial anisotropy energy of the system
         '''
-        #creating an empty list that will contain all the anisotropy energies
-        # of each atom
-        result = []
-        for i in self.s.array:
-            for j in i:
-                result.append(self.K*-1*(np.dot(j,
-                                                normalise(self.u)))**2)
-        return np.sum(result)
+        u = normalise(np.asarray(self.u, dtype=np.float64))
+        return -np.sum(self.K * (self._sites() @ u) ** 2)
 
     def exchange(self):
         '''
         Return the total exchange energy between the spins
         '''
-        #creating an empty list that will contain all the exchange energies
-        #betwen atoms, either vertical exchange and horizontal exchange
-        horizontal = []
-        vertical = []
-        for i in range(0,self.s.array.shape[0]):
-            for j in range(0,self.s.array.shape[1]-1):
-                horizontal.append(np.dot(self.s.array[i][j],
-                                         self.s.array[i][j+1]))
-        for j in range(0,self.s.array.shape[1]):
-            for i in range(0,self.s.array.shape[0]-1):
-                vertical.append(np.dot(self.s.array[i][j],
-                                       self.s.array[i+1][j]))
-
-        return -self.J*(sum(horizontal)+sum(vertical))
+        return self.interactions.exchange(self.s.array)
 
     def dmi(self):
         '''
         Return the total DMI energy between the spins
-        ''' 
-        #creating an empty list that will contain all the DMI energies
-        #betwen atoms, either vertical exchange and horizontal exchange
-        horizontal = []
-        vertical = []
-        #starting with a vertical/row iteration
-        for i in range(0,self.s.array.shape[0]):
-            for j in range(0,self.s.array.shape[1]-1):
-                horizontal.append(np.dot(np.array([1,0,0]),
-                                         (np.cross(self.s.array[i][j],
-                                                   self.s.array[i][j+1]))))
-        #ending with a horizontal/column iteration
-        for j in range(0,self.s.array.shape[1]):
-            for i in range(0,self.s.array.shape[0]-1):
-                vertical.append(np.dot(np.array([0,-1,0]),
-                                       (np.cross(self.s.array[i][j],
-                                                 self.s.array[i+1][j]))))
-
-        return self.D*(sum(horizontal)+sum(vertical))
-        
+        '''
+        return self.interactions.dmi(self.s.array)
@@ -0,0 +1,25 @@
+import pytest
+
+import mcsim
+
+
+@pytest.fixture
+def random_spins():
+    """Factory of spin fields with random directions, ``random_spins(n)``."""
+    def make(n=(5, 5)):
+        s = mcsim.Spins(n=n)
+        s.randomise()
+        return s
+    return make
+
+
+@pytest.fixture
+def random_system(random_spins):
+    """Factory of systems with random spins, ``random_system(n, **parameters)``.
+
+    The parameters that are not given are B=(0, 0, 0.1), K=0.01, u=(0, 0, 1), J=1 and
+    D=0.3, other keyword arguments (J2, dmi_type, mask) are passed to mcsim.System.
+    """
+    def make(n=(5, 5), B=(0, 0, 0.1), K=0.01, u=(0, 0, 1), J=1, D=0.3, **kwargs):
+        return mcsim.System(s=random_spins(n), B=B, K=K, u=u, J=J, D=D, **kwargs)
+    return make
@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 
 import mcsim
 
@@ -63,3 +64,191 @@ class TestIndividualEnergies:
 
         assert np.allclose(system.s.array, system.s.mean, rtol=rtol, atol=atol)
         assert np.allclose(abs(system.s), 1, rtol=rtol, atol=0.1)
+
+
+class TestClusterMoves:
+    def test_wolff_cluster(self):
+        n = (6, 6)
+        s = mcsim.Spins(n=n, value=(0, 0, 1))
+        r = np.array([0, 0, 1])
+
+        # Aligned spins with a large coupling form a single cluster.
+        cluster = mcsim.wolff_cluster(s.array, (2, 3), r, J=1, beta=50)
+
+        assert cluster.shape == n
+        assert cluster.all()
+
+    def test_wolff_cluster_perpendicular(self):
+        n = (6, 6)
+        s = mcsim.Spins(n=n, value=(1, 0, 0))
+        r = np.array([0, 0, 1])
+
+        # Spins perpendicular to r are never bonded.
+        cluster = mcsim.wolff_cluster(s.array, (2, 3), r, J=1, beta=50)
+
+        assert cluster[2, 3]
+        assert cluster.sum() == 1
+
+    def test_cluster_move_energy(self):
+        n = (5, 5)
+        s = mcsim.Spins(n=n)
+        s.randomise()
+
+        system = mcsim.System(s=s, B=(0, 0, 0.1), K=0.1, u=(0, 0, 1), J=1, D=0.2)
+        driver = mcsim.Driver()
+
+        for _ in range(20):
+            e0 = system.energy()
+            driver.cluster_move(system)
+            assert system.energy() <= e0 + 1e-12
+        assert np.allclose(abs(system.s), 1)
+
+    def test_exchange_cluster(self):
+        n = (5, 5)
+        s = mcsim.Spins(n=n)
+        s.randomise()
+
+        system = mcsim.System(s=s, B=(0, 0, 0), K=0, u=(0, 0, 1), J=1, D=0)
+
+        driver = mcsim.Driver()
+        driver.drive(system, n=20_000, cluster=0.2)
+
+        assert np.allclose(system.s.array, system.s.mean, rtol=rtol, atol=0.05)
+        assert np.allclose(abs(system.s), 1, rtol=rtol, atol=atol)
+
+    def test_drive_wrong_cluster(self):
+        s = mcsim.Spins(n=(3, 3))
+        system = mcsim.System(s=s, B=(0, 0, 0), K=0, u=(0, 0, 1), J=1, D=0)
+
+        with pytest.raises(ValueError):
+            mcsim.Driver().drive(system, n=10, cluster=1.5)
+
+    def test_wolff_cluster_site_exchange(self):
+        n = (6, 6)
+        s = mcsim.Spins(n=n, value=(0, 0, 1))
+        r = np.array([0, 0, 1])
+        J = np.ones(n)
+        J[:, 3:] = -1
+
+        # Pairs with J = -1 or across the J = 0 average are never bonded.
+        cluster = mcsim.wolff_cluster(s.array, (2, 1), r, J=J, beta=50)
+
+        assert cluster[:, :3].all()
+        assert not cluster[:, 3:].any()
+
+    def test_wolff_cluster_mask(self):
+        n = (5, 5)
+        s = mcsim.Spins(n=n, value=(0, 0, 1))
+        mask = np.ones(n, dtype=bool)
+        mask[:, 2] = False
+        interactions = mcsim.Interactions(n=n, J=1, mask=mask)
+
+        cluster = mcsim.wolff_cluster(s.array, (0, 0), np.array([0, 0, 1]), interactions,
+                                      beta=50)
+
+        assert cluster[:, :2].all()
+        assert not cluster[:, 2:].any()
+
+    def test_cluster_move_site_exchange(self):
+        n = (6, 6)
+        s = mcsim.Spins(n=n)
+        s.randomise()
+
+        system = mcsim.System(s=s, B=(0, 0, 0), K=0, u=(0, 0, 1), J=np.ones(n), D=0)
+        e0 = system.energy()
+
+        driver = mcsim.Driver()
+        driver.drive(system, n=50, cluster=0.5)
+
+        assert system.energy() <= e0
+        assert np.allclose(abs(system.s), 1)
+
+
+class TestGradientDriver:
+    def test_zeeman(self):
+        n = (5, 5)
+        s = mcsim.Spins(n=n)
+        s.randomise()
+
+        system = mcsim.System(s=s, B=(1, 0, 0), K=0, u=(0, 1, 0), J=0, D=0)
+
+        driver = mcsim.GradientDriver()
+        driver.drive(system, n=10_000)
+
+        assert driver.torque < 1e-6
+        assert np.allclose(system.s.mean, (1, 0, 0), rtol=rtol, atol=atol)
+        assert np.allclose(abs(system.s), 1)
+
+    def test_anisotropy(self):
+        n = (5, 5)
+        s = mcsim.Spins(n=n)
+        s.randomise()
+
+        system = mcsim.System(s=s, B=(0, 0, 0), K=1, u=(0, 0, 1), J=0, D=0)
+
+        driver = mcsim.GradientDriver()
+        driver.drive(system, n=10_000)
+
+        assert np.allclose(abs(system.s.array[..., -1]), 1, rtol=rtol, atol=atol)
+        assert np.allclose(abs(system.s), 1)
+
+    def test_exchange(self):
+        n = (5, 5)
+        s = mcsim.Spins(n=n)
+        s.randomise()
+
+        system = mcsim.System(s=s, B=(0, 0, 0), K=0, u=(0, 0, 1), J=1, D=0)
+
+        driver = mcsim.GradientDriver()
+        driver.drive(system, n=10_000)
+
+        assert np.allclose(system.s.array, system.s.mean, rtol=rtol, atol=atol)
+        assert np.allclose(abs(system.s), 1)
+
+    def test_energy_decreases(self):
+        n = (6, 6)
+        s = mcsim.Spins(n=n)
+        s.randomise()
+
+        system = mcsim.System(s=s, B=(0, 0, 0.2), K=0.05, u=(0, 0, 1), J=1, D=0.6)
+        e0 = system.energy()
+
+        driver = mcsim.GradientDriver()
+        driver.drive(system, n=50)
+
+        assert driver.steps == 50
+        assert system.energy() < e0
+
+    def test_converged(self):
+        n = (3, 3)
+        s = mcsim.Spins(n=n, value=(0, 0, 1))
+
+        system = mcsim.System(s=s, B=(0, 0, 1), K=0, u=(0, 0, 1), J=1, D=0)
+
+        driver = mcsim.GradientDriver()
+        driver.drive(system)
+
+        assert driver.steps == 0
+        assert np.allclose(system.s.array, (0, 0, 1))
+
+
+class TestConvergence:
+    def test_steps(self):
+        s = mcsim.Spins(n=(4, 4))
+        s.randomise()
+        system = mcsim.System(s=s, B=(0, 0, 1), K=0, u=(0, 0, 1), J=1, D=0)
+
+        driver = mcsim.Driver()
+        driver.drive(system, n=1_234)
+
+        assert driver.steps == 1_234
+
+    def test_tol(self):
+        s = mcsim.Spins(n=(4, 4), value=(0, 0, 1))
+        system = mcsim.System(s=s, B=(0, 0, 1), K=0, u=(0, 0, 1), J=1, D=0)
+
+        # The system is already in its ground state, nothing decreases the energy.
+        driver = mcsim.Driver()
+        driver.drive(system, n=10_000, tol=1e-6, window=100)
+
+        assert driver.steps == 100
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+import mcsim
+
+
+class TestInitialisation:
+    def test_init_nearest(self):
+        n = (5, 6)
+        interactions = mcsim.Interactions(n=n, J=1)
+
+        assert interactions.pairs.shape == (49, 2)
+        assert np.allclose(interactions.exchange_constants, 1)
+        assert interactions.indptr[-1] == 2 * 49
+        # Corners have two neighbours and inner sites four.
+        assert np.diff(interactions.indptr)[0] == 2
+        assert np.diff(interactions.indptr)[7] == 4
+
+    def test_init_next_nearest(self):
+        n = (5, 6)
+        interactions = mcsim.Interactions(n=n, J=1, J2=0.5)
+
+        assert interactions.pairs.shape == (49 + 2 * 20, 2)
+        assert np.diff(interactions.indptr)[7] == 8
+
+    def test_init_empty(self):
+        interactions = mcsim.Interactions(n=(4, 4))
+        s = mcsim.Spins(n=(4, 4))
+
+        assert interactions.pairs.shape == (0, 2)
+        assert np.isclose(interactions.exchange(s.array), 0)
+        assert np.allclose(interactions.field(s.array), 0)
+
+    def test_init_mask(self):
+        n = (5, 5)
+        mask = np.ones(n, dtype=bool)
+        mask[2, 2] = False
+        interactions = mcsim.Interactions(n=n, J=1, mask=mask)
+
+        assert interactions.pairs.shape == (40 - 4, 2)
+        assert np.diff(interactions.indptr)[2 * 5 + 2] == 0
+
+    def test_init_site_values(self):
+        n = (3, 3)
+        J = np.ones(n)
+        J[1, 1] = 0
+        interactions = mcsim.Interactions(n=n, J=J)
+
+        # Pairs with the defect have the average constant of their two sites.
+        assert sorted(interactions.exchange_constants) == [0.5] * 4 + [1] * 8
+
+    def test_init_wrong_shape(self):
+        with pytest.raises(ValueError):
+            mcsim.Interactions(n=(3, 3), J=np.ones((3, 4)))
+
+    def test_init_wrong_dmi_type(self):
+        with pytest.raises(ValueError):
+            mcsim.Interactions(n=(3, 3), D=1, dmi_type='surface')
+
+
+class TestEnergy:
+    def test_exchange_next_nearest(self):
+        n = (5, 6)
+        s = mcsim.Spins(n=n)
+        interactions = mcsim.Interactions(n=n, J=0, J2=1)
+
+        assert np.isclose(interactions.exchange(s.array), -40)
+
+    def test_dmi_bulk(self):
+        n = (5, 6)
+        s = mcsim.Spins(n=n)
+        s.array[:3, :, :] = (0, 1, 0)
+        s.array[3:, :, :] = (0, 0, 1)
+        interactions = mcsim.Interactions(n=n, D=1, dmi_type='bulk')
+
+        # Only the pairs across the x boundary contribute, x.(y x z) = 1.
+        assert np.isclose(interactions.dmi(s.array), 6)
+
+    def test_local_field(self):
+        n = (6, 5)
+        s = mcsim.Spins(n=n)
+        s.randomise()
+        interactions = mcsim.Interactions(n=n, J=1.2, D=0.4, J2=-0.3, dmi_type='bulk')
+
+        field = interactions.field(s.array)
+
+        for i, j in [(0, 0), (2, 3), (5, 4)]:
+            assert np.allclose(interactions.local_field(s.array, i, j), field[i, j])
+
+    def test_field_energy(self):
+        n = (6, 5)
+        s = mcsim.Spins(n=n)
+        s.randomise()
+        interactions = mcsim.Interactions(n=n, J=0.8, D=0.6, J2=0.2)
+
+        # Every pair is counted twice in the sum over all sites.
+        energy = interactions.exchange(s.array) + interactions.dmi(s.array)
+        assert np.isclose(-0.5 * np.sum(s.array * interactions.field(s.array)), energy)
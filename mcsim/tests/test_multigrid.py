@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+import mcsim
+from mcsim.multigrid import coarsen, downsample, upsample
+
+
+class TestDownsample:
+    def test_downsample_shape(self):
+        s = mcsim.Spins(n=(10, 7))
+        s.randomise()
+
+        coarse = downsample(s, factor=2)
+
+        assert coarse.array.shape == (5, 4, 3)
+        assert np.allclose(abs(coarse), 1)
+
+    def test_downsample_uniform(self):
+        value = (0, 0.6, 0.8)
+        s = mcsim.Spins(n=(8, 8), value=value)
+
+        assert np.allclose(downsample(s, factor=4).array, value)
+
+    def test_downsample_opposite(self):
+        s = mcsim.Spins(n=(4, 4))
+        s.array[::2, ...] = (0, 0, -1)
+
+        coarse = downsample(s)
+
+        assert np.allclose(coarse.array, (0, 0, -1))
+
+
+class TestUpsample:
+    def test_upsample_shape(self):
+        s = mcsim.Spins(n=(5, 4))
+        s.randomise()
+
+        fine = upsample(s, (10, 7))
+
+        assert fine.n == (10, 7)
+        assert fine.array.shape == (10, 7, 3)
+        assert np.allclose(abs(fine), 1)
+
+    def test_upsample_uniform(self):
+        value = (1, 0, 0)
+        s = mcsim.Spins(n=(3, 3), value=value)
+
+        assert np.allclose(upsample(s, (9, 9)).array, value)
+
+    def test_upsample_smooth(self):
+        n = (16, 16)
+        s = mcsim.Spins(n=n)
+        x = np.linspace(0, np.pi / 2, n[0]).reshape((-1, 1))
+        s.array[...] = 0
+        s.array[..., 0] = np.cos(x)
+        s.array[..., 2] = np.sin(x)
+
+        # A slowly varying field survives the round trip.
+        fine = upsample(downsample(s), n)
+
+        assert np.allclose(fine.array, s.array, atol=0.1)
+
+
+class TestCoarsen:
+    def test_coarsen(self):
+        s = mcsim.Spins(n=(8, 6))
+        system = mcsim.System(s=s, B=(0, 0, 0.1), K=0.2, u=(0, 0, 1), J=1, D=0.3)
+
+        coarse = coarsen(system, factor=2)
+
+        assert coarse.s.array.shape == (4, 3, 3)
+        assert np.allclose(coarse.B, (0, 0, 0.4))
+        assert np.isclose(coarse.K, 0.8)
+        assert np.isclose(coarse.J, 1)
+        assert np.isclose(coarse.D, 0.6)
+        assert np.allclose(coarse.u, system.u)
+
+    def test_coarsen_site_values(self):
+        n = (4, 4)
+        s = mcsim.Spins(n=n)
+        K = np.zeros(n)
+        K[:2, :2] = 1
+        mask = np.ones(n, dtype=bool)
+        mask[2:, 2:] = False
+        system = mcsim.System(s=s, B=(0, 0, 0), K=K, u=(0, 0, 1), J=1, D=0, J2=0.1,
+                              dmi_type='bulk', mask=mask)
+
+        coarse = coarsen(system, factor=2)
+
+        assert np.allclose(coarse.K, [[4, 0], [0, 0]])
+        assert np.array_equal(coarse.mask, [[True, True], [True, False]])
+        assert np.isclose(coarse.J2, 0.1)
+        assert coarse.dmi_type == 'bulk'
+
+
+class TestMultigridDriver:
+    def test_drive(self):
+        n = (8, 8)
+        s = mcsim.Spins(n=n)
+        s.randomise()
+        system = mcsim.System(s=s, B=(0, 0, 0.5), K=0, u=(0, 0, 1), J=1, D=0)
+        e0 = system.energy()
+
+        multigrid = mcsim.MultigridDriver(levels=3)
+        multigrid.drive(system, n=[200, 100, 100])
+
+        assert system.s is s
+        assert [t[0] for t in multigrid.timings] == [(2, 2), (4, 4), (8, 8)]
+        assert np.isclose(multigrid.timings[-1][2], system.energy())
+        assert system.energy() < e0
+        assert np.allclose(abs(system.s), 1)
+
+    def test_drive_levels_limited(self):
+        s = mcsim.Spins(n=(6, 6))
+        system = mcsim.System(s=s, B=(0, 0, 0), K=0, u=(0, 0, 1), J=1, D=0)
+
+        multigrid = mcsim.MultigridDriver(levels=5)
+        multigrid.drive(system, n=10)
+
+        assert [t[0] for t in multigrid.timings] == [(3, 3), (6, 6)]
+
+    def test_init_wrong_factor(self):
+        with pytest.raises(ValueError):
+            mcsim.MultigridDriver(factor=1)
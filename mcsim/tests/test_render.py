@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pytest
+
+import mcsim
+
+
+class TestInitialisation:
+    def test_init(self):
+        n = (10, 12)
+        renderer = mcsim.Renderer(n=n)
+
+        assert renderer.n == n
+        assert renderer.step == 1
+
+    def test_init_downsample(self):
+        n = (200, 100)
+        renderer = mcsim.Renderer(n=n, max_arrows=25)
+
+        assert renderer.step == 8
+
+    def test_init_wrong_step(self):
+        with pytest.raises(ValueError):
+            mcsim.Renderer(n=(10, 10), step=0)
+
+
+class TestRender:
+    def test_render(self, random_spins):
+        n = (20, 15)
+        renderer = mcsim.Renderer(n=n, step=3, figsize=(6, 3), dpi=50)
+        s1, s2 = random_spins(n), random_spins(n)
+
+        image1 = renderer.render(s1)
+        image2 = renderer.render(s2.array)
+
+        assert image1.shape == (150, 300, 4)
+        assert image1.shape == image2.shape
+        assert not np.array_equal(image1, image2)
+
+    def test_render_wrong_shape(self):
+        renderer = mcsim.Renderer(n=(5, 5))
+        s = mcsim.Spins(n=(5, 6))
+
+        with pytest.raises(ValueError):
+            renderer.render(s)
+
+
+class TestSave:
+    def test_save_frames(self, tmp_path, random_spins):
+        n = (8, 8)
+        renderer = mcsim.Renderer(n=n, figsize=(4, 2), dpi=40)
+        trajectory = [random_spins(n) for _ in range(3)]
+
+        filenames = renderer.save_frames(trajectory, tmp_path / 'frames')
+
+        assert len(filenames) == 3
+        assert all(os.path.isfile(f) for f in filenames)
+
+    def test_save_frames_parallel(self, tmp_path, random_spins):
+        n = (8, 8)
+        renderer = mcsim.Renderer(n=n, figsize=(4, 2), dpi=40)
+        trajectory = [random_spins(n) for _ in range(5)]
+
+        filenames = renderer.save_frames(trajectory, tmp_path, processes=2)
+
+        assert sorted(os.listdir(tmp_path)) == [os.path.basename(f) for f in filenames]
+
+    def test_animate_gif(self, tmp_path, random_spins):
+        n = (8, 8)
+        renderer = mcsim.Renderer(n=n, figsize=(4, 2), dpi=40)
+        filename = str(tmp_path / 'animation.gif')
+        trajectory = [random_spins(n) for _ in range(3)]
+
+        renderer.animate(trajectory, filename, fps=5)
+
+        assert os.path.getsize(filename) > 0
@@ -0,0 +1,175 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+import mcsim
+
+
+def append_worker(args):
+    path, seed = args
+    np.random.seed(seed)
+    store = mcsim.ResultStore(path)
+    for i in range(5):
+        s = mcsim.Spins(n=(6, 5))
+        s.randomise()
+
+        B = (0, 0, 0.1)
+        K = 0.01
+        u = (0, 0, 1)
+        J = 1
+        D = i / 10
+
+        store.append(mcsim.System(s=s, B=B, K=K, u=u, J=J, D=D), seed=seed)
+
+
+class TestAppend:
+    def test_append_load(self, tmp_path, random_system):
+        store = mcsim.ResultStore(tmp_path / 'store')
+        systems = [random_system(n=(6, 5)), random_system(n=(3, 4), J=2)]
+
+        indices = [store.append(system, seed=i) for i, system in enumerate(systems)]
+
+        assert indices == [0, 1]
+        assert len(store) == 2
+        for i, system in zip(indices, systems):
+            assert np.array_equal(store.load(i), system.s.array)
+        assert np.array_equal(store.index['shape'], [(6, 5), (3, 4)])
+        assert np.allclose(store.index['J'], (1, 2))
+        assert np.array_equal(store.index['seed'], (0, 1))
+
+    def test_reopen(self, tmp_path, random_system):
+        system = random_system()
+        mcsim.ResultStore(tmp_path).append(system)
+
+        store = mcsim.ResultStore(tmp_path)
+
+        assert len(store) == 1
+        assert np.array_equal(store.load(0), system.s.array)
+
+    def test_append_site_values(self, tmp_path, random_system):
+        store = mcsim.ResultStore(tmp_path)
+        system = random_system()
+        system.K = np.zeros(system.s.array.shape[:2])
+
+        with pytest.raises(ValueError):
+            store.append(system)
+
+    def test_append_parallel(self, tmp_path):
+        path = str(tmp_path)
+        with multiprocessing.Pool(4) as pool:
+            pool.map(append_worker, [(path, seed) for seed in range(4)])
+
+        store = mcsim.ResultStore(path)
+
+        assert len(store) == 20
+        assert sorted(store.index['seed']) == sorted(list(range(4)) * 5)
+        for i in range(len(store)):
+            assert np.allclose(np.linalg.norm(store.load(i), axis=2), 1)
+
+
+class TestLoad:
+    def test_load_rows(self, tmp_path, random_system):
+        store = mcsim.ResultStore(tmp_path, chunk_rows=4)
+        system = random_system(n=(11, 3))
+        store.append(system)
+
+        assert np.array_equal(store.load(0, rows=slice(3, 9)), system.s.array[3:9])
+        assert np.array_equal(store.load(0, rows=slice(-2, None)), system.s.array[-2:])
+        assert store.load(0, rows=slice(5, 5)).shape == (0, 3, 3)
+
+    def test_lattices(self, tmp_path, random_system):
+        store = mcsim.ResultStore(tmp_path)
+        systems = [random_system() for _ in range(3)]
+        for system in systems:
+            store.append(system)
+
+        lattices = list(store.lattices([2, 0]))
+
+        assert np.array_equal(lattices[0], systems[2].s.array)
+        assert np.array_equal(lattices[1], systems[0].s.array)
+
+    def test_system(self, tmp_path, random_system):
+        store = mcsim.ResultStore(tmp_path)
+        system = random_system(B=(0.1, 0.2, 0.3), K=0.4, u=(0, 1, 0), J=0.6, D=0.7)
+        store.append(system)
+
+        loaded = store.system(0)
+
+        assert np.isclose(loaded.energy(), system.energy())
+        assert np.allclose(loaded.B, system.B)
+        assert np.isclose(loaded.D, system.D)
+
+
+class TestQuery:
+    def test_query(self, tmp_path, random_system):
+        store = mcsim.ResultStore(tmp_path)
+        for D in (0.1, 0.2, 0.3):
+            for J in (1, 2):
+                store.append(random_system(J=J, D=D))
+        store.append(random_system(n=(3, 3), J=1, D=0.2))
+
+        assert list(store.query(D=0.2)) == [2, 3, 6]
+        assert list(store.query(J=1, D=0.2)) == [2, 6]
+        assert list(store.query(J=1, D=0.2, shape=(5, 5))) == [2]
+        assert list(store.query(B=(0, 0, 0.1), J=3)) == []
+
+    def test_query_extended(self, tmp_path, random_system):
+        store = mcsim.ResultStore(tmp_path)
+        for J2 in (0, 0.5):
+            for dmi_type in ('interfacial', 'bulk'):
+                system = random_system()
+                system.J2 = J2
+                system.dmi_type = dmi_type
+                store.append(system)
+
+        assert list(store.query(J2=0.5)) == [2, 3]
+        assert list(store.query(dmi_type='bulk')) == [1, 3]
+        assert list(store.query(J2=0, dmi_type='bulk')) == [1]
+
+    def test_query_wrong_parameter(self, tmp_path):
+        store = mcsim.ResultStore(tmp_path)
+
+        with pytest.raises(ValueError):
+            store.query(T=1)
+
+    def test_nearest(self, tmp_path, random_system):
+        store = mcsim.ResultStore(tmp_path)
+        for Bz in (0.0, 0.1, 0.2, 0.3):
+            store.append(random_system(B=(0, 0, Bz)))
+
+        assert list(store.nearest(B=(0, 0, 0.18))) == [2]
+        assert list(store.nearest(B=(0, 0, 0.12), k=2)) == [1, 2]
+        assert list(store.nearest(B=(0, 0, 0), shape=(2, 2))) == []
+
+    def test_nearest_extended(self, tmp_path, random_system):
+        store = mcsim.ResultStore(tmp_path)
+        for J2, dmi_type in ((0, 'interfacial'), (0.5, 'interfacial'), (0.5, 'bulk')):
+            system = random_system()
+            system.J2 = J2
+            system.dmi_type = dmi_type
+            store.append(system)
+
+        assert list(store.nearest(J2=0.4)) == [1]
+        assert list(store.nearest(J2=0.1, dmi_type='bulk')) == [2]
+
+    def test_system_extended(self, tmp_path, random_system):
+        store = mcsim.ResultStore(tmp_path)
+        system = random_system()
+        system.J2 = 0.5
+        system.dmi_type = 'bulk'
+        store.append(system)
+
+        loaded = store.system(0)
+
+        assert np.isclose(loaded.energy(), system.energy())
+        assert np.isclose(loaded.J2, 0.5)
+        assert loaded.dmi_type == 'bulk'
+
+    def test_append_mask(self, tmp_path, random_system):
+        store = mcsim.ResultStore(tmp_path)
+        system = random_system()
+        system.mask = np.ones(system.s.array.shape[:2], dtype=bool)
+
+        with pytest.raises(ValueError):
+            store.append(system)
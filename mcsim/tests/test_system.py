@@ -1,6 +1,7 @@
 import numbers
 
 import numpy as np
+import pytest
 
 import mcsim
 
@@ -221,3 +222,162 @@ class TestDMI:
         system = mcsim.System(s=s, B=B, K=K, u=u, J=J, D=D)
 
         assert np.isclose(system.dmi(), 5)
+
+
+class TestEffectiveField:
+    def test_effective_field_shape(self):
+        n = (6, 7)
+        s = mcsim.Spins(n=n)
+        s.randomise()
+
+        system = mcsim.System(s=s, B=(0, 0, 1), K=0.1, u=(0, 1, 0), J=1, D=0.5)
+
+        assert system.effective_field().shape == (*n, 3)
+
+    def test_effective_field_zeeman(self):
+        n = (4, 4)
+        s = mcsim.Spins(n=n)
+        s.randomise()
+
+        B = (0.1, 0.2, 0.3)
+        system = mcsim.System(s=s, B=B, K=0, u=(0, 1, 0), J=0, D=0)
+
+        assert np.allclose(system.effective_field(), B)
+
+    def test_effective_field_gradient(self):
+        n = (4, 5)
+        s = mcsim.Spins(n=n)
+        s.randomise()
+
+        system = mcsim.System(s=s, B=(0.1, -0.3, 0.5), K=0.7, u=(1, 2, 2), J=1.3, D=0.9)
+        field = system.effective_field()
+
+        # Compare with the central finite difference of the total energy.
+        eps = 1e-6
+        gradient = np.empty_like(field)
+        for index in np.ndindex(s.array.shape):
+            s.array[index] += eps
+            e_plus = system.energy()
+            s.array[index] -= 2 * eps
+            e_minus = system.energy()
+            s.array[index] += eps
+            gradient[index] = (e_plus - e_minus) / (2 * eps)
+
+        assert np.allclose(field, -gradient, atol=1e-6)
+
+
+class TestExtendedModel:
+    def test_next_nearest_exchange(self):
+        n = (5, 6)
+        s = mcsim.Spins(n=n)
+
+        system = mcsim.System(s=s, B=(0, 0, 0), K=0, u=(0, 0, 1), J=1, D=0, J2=0.5)
+
+        assert np.isclose(system.exchange(), -49 - 0.5 * 40)
+
+    def test_site_anisotropy(self):
+        n = (10, 10)
+        s = mcsim.Spins(n=n)
+        K = np.zeros(n)
+        K[:5, :] = 1
+
+        system = mcsim.System(s=s, B=(0, 0, 0), K=K, u=(0, 0, 1), J=0, D=0)
+
+        assert np.isclose(system.anisotropy(), -50)
+
+    def test_site_zeeman(self):
+        n = (4, 4)
+        s = mcsim.Spins(n=n)
+        B = np.zeros((*n, 3))
+        B[0, 0] = (0, 0, 2)
+
+        system = mcsim.System(s=s, B=B, K=0, u=(0, 0, 1), J=0, D=0)
+
+        assert np.isclose(system.zeeman(), -2)
+
+    def test_mask(self):
+        n = (5, 6)
+        s = mcsim.Spins(n=n)
+        mask = np.ones(n, dtype=bool)
+        mask[:, 3:] = False
+
+        system = mcsim.System(s=s, B=(0, 0, 1), K=1, u=(0, 0, 1), J=1, D=0, mask=mask)
+
+        assert np.isclose(system.zeeman(), -15)
+        assert np.isclose(system.anisotropy(), -15)
+        assert np.isclose(system.exchange(), -22)
+        assert np.allclose(system.effective_field()[:, 3:], 0)
+        assert system.delta_energy(0, 4, np.array([1, 0, 0])) == 0
+
+    def test_parameters_changed(self):
+        n = (5, 6)
+        s = mcsim.Spins(n=n)
+
+        system = mcsim.System(s=s, B=(0, 0, 1), K=1, u=(0, 1, 0), J=1, D=0.7)
+        assert np.isclose(system.exchange(), -49)
+
+        system.J = 2
+        assert np.isclose(system.exchange(), -98)
+
+    def test_delta_energy(self):
+        n = (6, 7)
+        s = mcsim.Spins(n=n)
+        s.randomise()
+
+        system = mcsim.System(s=s, B=(0.1, -0.3, 0.5), K=0.7, u=(1, 2, 2), J=1.3, D=0.9,
+                              J2=-0.4, dmi_type='bulk')
+
+        for i, j in [(0, 0), (3, 4), (5, 6)]:
+            s1 = mcsim.random_spin(s.array[i, j], alpha=0.5)
+            e0 = system.energy()
+            delta = system.delta_energy(i, j, s1)
+            s.array[i, j] = s1
+            assert np.isclose(delta, system.energy() - e0)
+
+    def test_effective_field_gradient_extended(self):
+        n = (4, 5)
+        s = mcsim.Spins(n=n)
+        s.randomise()
+        mask = np.ones(n, dtype=bool)
+        mask[1, 2] = False
+
+        system = mcsim.System(s=s, B=(0.1, -0.3, 0.5), K=np.random.random(n), u=(1, 2, 2),
+                              J=1.3, D=0.9, J2=-0.4, dmi_type='bulk', mask=mask)
+        field = system.effective_field()
+
+        eps = 1e-6
+        gradient = np.empty_like(field)
+        for index in np.ndindex(s.array.shape):
+            s.array[index] += eps
+            e_plus = system.energy()
+            s.array[index] -= 2 * eps
+            e_minus = system.energy()
+            s.array[index] += eps
+            gradient[index] = (e_plus - e_minus) / (2 * eps)
+
+        assert np.allclose(field, -gradient, atol=1e-6)
+
+    def test_site_values_read_only(self):
+        n = (5, 6)
+        s = mcsim.Spins(n=n)
+        J = np.ones(n)
+        mask = np.ones(n, dtype=bool)
+
+        system = mcsim.System(s=s, B=(0, 0, 1), K=1, u=(0, 1, 0), J=J, D=0, mask=mask)
+        assert np.isclose(system.exchange(), -49)
+
+        # The system holds its own copies, changing the originals has no effect.
+        J[0, 0] = 0
+        mask[0, 0] = False
+        assert np.isclose(system.exchange(), -49)
+
+        with pytest.raises(ValueError):
+            system.J[0, 0] = 0
+        with pytest.raises(ValueError):
+            system.mask[0, 0] = False
+
+        mask = system.mask.copy()
+        mask[0, 0] = False
+        system.mask = mask
+        assert np.isclose(system.exchange(), -47)
+        assert np.isclose(system.zeeman(), -29)
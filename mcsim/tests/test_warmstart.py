@@ -0,0 +1,182 @@
+import numpy as np
+import pytest
+
+import mcsim
+
+
+class TestSeed:
+    def test_seed_miss(self, random_system):
+        cache = mcsim.WarmStartCache()
+        system = random_system()
+        array = system.s.array.copy()
+
+        assert not cache.seed(system)
+        assert np.array_equal(system.s.array, array)
+        assert cache.misses == 1
+
+    def test_seed_nearest(self, random_system):
+        cache = mcsim.WarmStartCache()
+        systems = [random_system(B=(0, 0, Bz)) for Bz in (0.1, 0.2, 0.3)]
+        for system in systems:
+            cache.store(system)
+        cache.store(random_system(n=(4, 4), B=(0, 0, 0.22)))
+
+        system = random_system(B=(0, 0, 0.22))
+
+        assert cache.seed(system)
+        assert np.array_equal(system.s.array, systems[1].s.array)
+        assert cache.hit_rate == 1
+
+    def test_seed_noise(self, random_system):
+        cache = mcsim.WarmStartCache(noise=0.1)
+        cache.store(random_system())
+        system = random_system()
+
+        cache.seed(system)
+
+        assert not np.array_equal(system.s.array, cache.lattices[cache.nearest(system)])
+        assert np.allclose(abs(system.s), 1)
+
+    def test_seed_max_distance(self, random_system):
+        cache = mcsim.WarmStartCache(max_distance=0.05)
+        cache.store(random_system(D=0.3))
+
+        assert not cache.seed(random_system(D=0.5))
+        assert cache.seed(random_system(D=0.32))
+
+    def test_seed_extended(self, random_system):
+        cache = mcsim.WarmStartCache(max_distance=0.3)
+        system = random_system()
+        system.J2 = 0.2
+        system.dmi_type = 'bulk'
+        cache.store(system)
+
+        # The type of DMI has to match exactly.
+        assert not cache.seed(random_system())
+
+        other = random_system()
+        other.dmi_type = 'bulk'
+        assert cache.seed(other)
+
+        # J2 counts towards the distance.
+        other.J2 = 0.6
+        assert not cache.seed(other)
+
+    def test_seed_mask(self, random_system):
+        cache = mcsim.WarmStartCache()
+        mask = np.ones((5, 5), dtype=bool)
+        mask[2, 2] = False
+        system = random_system()
+        system.mask = mask
+        cache.store(system)
+
+        assert not cache.seed(random_system())
+
+        other = random_system()
+        other.mask = mask.copy()
+        assert cache.seed(other)
+
+    def test_seed_site_values(self, random_system):
+        cache = mcsim.WarmStartCache()
+        system = random_system()
+        system.K = np.zeros((5, 5))
+
+        with pytest.raises(ValueError):
+            cache.seed(system)
+
+
+class TestStore:
+    def test_store_copy(self, random_system):
+        cache = mcsim.WarmStartCache()
+        system = random_system()
+        cache.store(system)
+        array = system.s.array.copy()
+
+        system.s.array[0, 0] = (1, 0, 0)
+
+        assert np.array_equal(cache.lattices[cache.nearest(system)], array)
+
+    def test_store_eviction(self, random_system):
+        nbytes = 5 * 5 * 3 * 8
+        cache = mcsim.WarmStartCache(maxsize=2 * nbytes)
+        systems = [random_system(D=D) for D in (0.1, 0.2, 0.3)]
+        cache.store(systems[0])
+        cache.store(systems[1])
+        cache.seed(random_system(D=0.1))  # makes D=0.1 the most recently used
+        cache.store(systems[2])
+
+        assert len(cache) == 2
+        assert cache.size == 2 * nbytes
+        # D is the ninth parameter, after B, K, u and J.
+        assert sorted(key[1][8] for key in cache.lattices) == [0.1, 0.3]
+
+    def test_store_too_large(self, random_system):
+        cache = mcsim.WarmStartCache(maxsize=10)
+        cache.store(random_system())
+
+        assert len(cache) == 0
+
+
+class TestDrive:
+    def test_drive_report(self, random_system):
+        cache = mcsim.WarmStartCache()
+        driver = mcsim.GradientDriver()
+
+        hits = [cache.drive(driver, random_system(B=(0, 0, Bz)), n=5_000, tol=1e-4)
+                for Bz in (0.3, 0.31, 0.32)]
+        report = cache.report()
+
+        assert hits == [False, True, True]
+        assert report['hits'] == 2
+        assert report['misses'] == 1
+        assert np.isclose(report['hit_rate'], 2 / 3)
+        assert report['moves_saved'] > 0
+
+    def test_report_cold_steps(self):
+        cache = mcsim.WarmStartCache()
+        cache.cold_steps = [400]
+        cache.warm_steps = [100, 150]
+
+        estimate = cache.report()
+        total = cache.report(cold_steps=900)
+        per_run = cache.report(cold_steps=[400, 250, 250])
+
+        assert estimate['moves_saved'] == 550
+        assert estimate['cold_samples'] == 1
+        assert total['moves_saved'] == 250
+        assert np.isclose(total['moves_saved_fraction'], 250 / 900)
+        assert total['cold_samples'] is None
+        assert per_run == total
+        with pytest.raises(ValueError):
+            cache.report(cold_steps=[400, 500])
+
+    def test_report_empty(self):
+        report = mcsim.WarmStartCache().report()
+
+        assert report['hit_rate'] == 0
+        assert report['moves_saved'] is None
+
+    def test_drive_monte_carlo(self, random_system):
+        cache = mcsim.WarmStartCache()
+        driver = mcsim.Driver()
+
+        for Bz in (0.3, 0.31, 0.32):
+            np.random.seed(0)
+            cache.drive(driver, random_system(B=(0, 0, Bz)), n=100_000, tol=1e-3, window=500)
+        report = cache.report()
+
+        assert driver.steps < 100_000
+        assert report['hit_rate'] == 2 / 3
+        assert report['moves_saved'] > 0
+
+    def test_drive_without_steps(self, random_system):
+        class FixedDriver:
+            def drive(self, system, n):
+                pass
+
+        cache = mcsim.WarmStartCache()
+        for Bz in (0.3, 0.31):
+            cache.drive(FixedDriver(), random_system(B=(0, 0, Bz)), n=10)
+
+        assert cache.report()['hit_rate'] == 0.5
+        assert cache.report()['moves_saved'] is None
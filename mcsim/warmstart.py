@@ -0,0 +1,299 @@
+'''
+This is a module that reuses relaxed states of a 2D Lattice of Spins between simulations.
+
+When a parameter (B or D, for example) is swept in small steps, the relaxed state of one
+point is a much better starting state for the next point than a random lattice. The warm
+start cache keeps the relaxed lattices of recent simulations, keyed by the shape of the
+lattice, the type of DMI, the mask and the parameters B, K, u, J, D and J2. A new
+simulation is seeded with the lattice of the nearest cached parameter point that has the
+same shape, type of DMI and mask, optionally with some noise.
+
+The cache holds at most maxsize bytes of lattices, the least recently used lattices are
+evicted first. It counts hits and misses, and the moves saved against a cold start for
+drivers that stop once the system has converged: GradientDriver, or Driver given a tol.
+
+Example usage:
+    cache = mcsim.WarmStartCache(maxsize=100 * 2**20) # At most 100 MB of lattices
+    driver = mcsim.GradientDriver()
+    for D in np.linspace(0, 1, 21):
+        system = mcsim.System(s=s, B=(0, 0, 0.1), K=0.01, u=(0, 0, 1), J=1, D=D)
+        cache.drive(driver, system, n=10_000) # Seed, relax and store the system
+    cache.report() # Hit rate and an estimate of the moves saved
+    cache.report(cold_steps=50_000) # Moves saved against 50000 moves of a cold sweep
+    cache.drive(mcsim.Driver(), system, n=100_000, tol=1e-3) # Monte Carlo until converged
+
+'''
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _parameters(system):
+    '''
+    This is a sub function that collects the parameters of a system into a single vector
+
+    Parameters
+    ------------
+    system: the system, with a single value of B, K, u, J, D and J2 for all sites
+
+    Returns
+    ------------
+    The vector (Bx, By, Bz, K, ux, uy, uz, J, D, J2)
+    '''
+    values = []
+    for name, size in (('B', 3), ('K', 1), ('u', 3), ('J', 1), ('D', 1), ('J2', 1)):
+        value = np.asarray(getattr(system, name), dtype=np.float64).ravel()
+        if value.size != size:
+            raise ValueError(f"Only systems with a single value of {name} can be "
+                             f"cached, not {value.size} values.")
+        values.extend(value)
+    return tuple(values)
+
+
+class WarmStartCache:
+    """Cache of relaxed lattices used to seed new simulations.
+
+    Parameters
+    ----------
+    maxsize: int
+
+        Maximum total size of the cached lattices in bytes. Defaults to
+        256 MB.
+
+    noise: float
+
+        Larger noise, larger the random modification of the seeded spins, as
+        ``alpha`` in ``random_spin``. Defaults to 0.0.
+
+    max_distance: float
+
+        Cached lattices whose parameters are further than ``max_distance``
+        (Euclidean distance over B, K, u, J, D and J2) are not used. Defaults
+        to None, meaning any distance.
+
+    """
+
+    def __init__(self, maxsize=256 * 2**20, noise=0.0, max_distance=None):
+        '''
+        Init function initializes the user inputs into the class created
+        '''
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive.")
+        self.maxsize = maxsize
+        self.noise = noise
+        self.max_distance = max_distance
+        self.lattices = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.cold_steps = []
+        self.warm_steps = []
+        self.unmeasured = 0
+
+    def __len__(self):
+        return len(self.lattices)
+
+    def _key(self, system):
+        '''
+        Return the key of a system. Its first part (the shape of the lattice, the type of DMI
+        and a fingerprint of the mask) has to match exactly, its second part is the vector of
+        parameters the distance is measured over.
+        '''
+        mask = system.mask
+        if mask is not None:
+            mask = hashlib.sha1(np.packbits(np.asarray(mask, dtype=bool))).hexdigest()
+        return ((system.s.array.shape[:2], system.dmi_type, mask), _parameters(system))
+
+    def nearest(self, system):
+        """Find the cached lattice nearest to a system.
+
+        Parameters
+        ----------
+        system: mcsim.System
+
+            The system.
+
+        Returns
+        -------
+        tuple
+
+            Key of the nearest cached lattice with the same shape, type of DMI
+            and mask, or None if there is none within ``max_distance``.
+
+        """
+        exact, parameters = self._key(system)
+        best, best_distance = None, np.inf
+        for key in self.lattices:
+            if key[0] != exact:
+                continue
+            distance = np.linalg.norm(np.subtract(key[1], parameters))
+            if distance < best_distance:
+                best, best_distance = key, distance
+        if self.max_distance is not None and best_distance > self.max_distance:
+            return None
+        return best
+
+    def seed(self, system, noise=None):
+        """Initialise the spins of a system from the nearest cached lattice.
+
+        If there is no cached lattice to use, the spins are not changed.
+
+        Parameters
+        ----------
+        system: mcsim.System
+
+            The system to be seeded.
+
+        noise: float
+
+            Overrides the noise of the cache for this call. Defaults to None.
+
+        Returns
+        -------
+        bool
+
+            True if the system was seeded (a hit), False otherwise (a miss).
+
+        """
+        key = self.nearest(system)
+        if key is None:
+            self.misses += 1
+            return False
+        self.hits += 1
+        self.lattices.move_to_end(key)
+        noise = self.noise if noise is None else noise
+        array = self.lattices[key].copy()
+        if noise:
+            array += (2 * np.random.random(array.shape) - 1) * noise
+            array /= np.linalg.norm(array, axis=2, keepdims=True)
+        system.s.array = array
+        return True
+
+    def store(self, system):
+        """Add the spins of a (relaxed) system to the cache.
+
+        The least recently used lattices are evicted until the cache fits into
+        ``maxsize``. A lattice larger than ``maxsize`` is not stored.
+
+        Parameters
+        ----------
+        system: mcsim.System
+
+            The system.
+
+        """
+        key = self._key(system)
+        if key in self.lattices:
+            self.size -= self.lattices.pop(key).nbytes
+        array = np.copy(system.s.array)
+        if array.nbytes > self.maxsize:
+            return
+        self.lattices[key] = array
+        self.size += array.nbytes
+        while self.size > self.maxsize:
+            _, evicted = self.lattices.popitem(last=False)
+            self.size -= evicted.nbytes
+
+    def drive(self, driver, system, n, **kwargs):
+        """Seed a system, relax it with a driver and store the result.
+
+        Parameters
+        ----------
+        driver: Driver Class
+
+            The driver, for example ``mcsim.GradientDriver()``. Its ``steps``
+            attribute after ``drive`` is used as the number of moves made. For
+            ``mcsim.Driver``, pass ``tol`` so that it stops once converged,
+            otherwise every run makes all n moves.
+
+        system: System Class
+
+            The System that is automatically passed.
+
+        n: int
+
+            Number of iterations passed to the driver.
+
+        kwargs
+
+            Other keyword arguments are passed to ``driver.drive``.
+
+        Returns
+        -------
+        bool
+
+            True if the system was seeded from the cache.
+
+        """
+        hit = self.seed(system)
+        driver.drive(system, n, **kwargs)
+        steps = getattr(driver, 'steps', None)
+        if steps is None:
+            self.unmeasured += 1
+        else:
+            (self.warm_steps if hit else self.cold_steps).append(steps)
+        self.store(system)
+        return hit
+
+    @property
+    def hit_rate(self):
+        """Fraction of the seeding attempts that were hits."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def report(self, cold_steps=None):
+        """Statistics of the cache.
+
+        The moves saved are measured against ``cold_steps``, the moves made
+        by the same runs from cold starts, for example the steps of the same
+        sweep relaxed without the cache. If it is not given, they are only
+        estimated from the cold starts made through ``drive``, as their
+        average number of moves times the number of warm starts, minus the
+        moves the warm starts actually made. A sweep usually makes a single
+        cold start, so the estimate can be far off.
+
+        Parameters
+        ----------
+        cold_steps: int or Iterable
+
+            Moves made from cold starts, either the total over all the runs
+            made through ``drive`` or one number per run. Defaults to None,
+            meaning the moves saved are estimated.
+
+        Returns
+        -------
+        dict
+
+            ``hits``, ``misses``, ``hit_rate``, ``lattices`` (number cached),
+            ``size`` (bytes cached), ``moves_saved``, ``moves_saved_fraction``
+            and ``cold_samples``, the number of cold starts the estimate rests
+            on (None if ``cold_steps`` is given). ``moves_saved`` and
+            ``moves_saved_fraction`` are None if a driver did not report the
+            number of moves it made, or if they are estimated and no cold
+            start has been made through ``drive``.
+
+        """
+        moves_saved, fraction, samples = None, None, None
+        runs = len(self.cold_steps) + len(self.warm_steps)
+        if cold_steps is not None:
+            cold_steps = np.asarray(cold_steps, dtype=np.float64)
+            if cold_steps.ndim != 0 and cold_steps.size != runs:
+                raise ValueError(f"cold_steps must be a total or have one value per run, "
+                                 f"not {cold_steps.size} values for {runs} runs.")
+            if not self.unmeasured:
+                baseline = np.sum(cold_steps)
+                moves_saved = baseline - np.sum(self.cold_steps) - np.sum(self.warm_steps)
+                if baseline:
+                    fraction = moves_saved / baseline
+        else:
+            samples = len(self.cold_steps)
+            if self.cold_steps and not self.unmeasured:
+                cold = np.mean(self.cold_steps)
+                moves_saved = cold * len(self.warm_steps) - np.sum(self.warm_steps)
+                if self.warm_steps:
+                    fraction = moves_saved / (cold * len(self.warm_steps))
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hit_rate,
+                'lattices': len(self), 'size': self.size, 'moves_saved': moves_saved,
+                'moves_saved_fraction': fraction, 'cold_samples': samples}